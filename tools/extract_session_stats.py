@@ -5,7 +5,9 @@ Phase System v2 Calibration Data Extractor
 Parses Sierra Chart AMT study logs and extracts per-session calibration metrics.
 
 Usage:
-    python extract_session_stats.py <logfile.txt> [--output calibration_report.txt]
+    python extract_session_stats.py <logfile.txt> [--output calibration_report.txt] [--jobs N]
+
+    --jobs N  extract sessions in N worker processes (default 1)
 
 Input: Sierra Chart message log export (copy/paste from Log window)
 Output: Structured calibration report with metrics per session
@@ -13,13 +15,70 @@ Output: Structured calibration report with metrics per session
 Requirements: Python 3.6+
 """
 
+import argparse
+import mmap
 import re
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, TextIO, Tuple
 from datetime import datetime
 
-@dataclass
+# Log tags kept by the line filter (SHAPE_FREEZE uses [SESSION] tag)
+_TAG_RE = re.compile(rb'\[(?:AMT|SESSION)\]')
+# Line terminators recognized by text-mode (universal newlines) reading
+_EOL_RE = re.compile(rb'\r\n|\r|\n')
+
+# Section tags dispatched in extract_session_stats (no two can overlap in a line)
+_SECTION_RE = re.compile(r'Phase Distribution:|Transitions:|REGIME:|Struct:|VA:|Market State:|SHAPE_FREEZE:')
+
+# Field patterns (compiled once; the parsers run per log line)
+_FREEZE_BAR_RE = re.compile(r't_freeze=(\d+)')
+_FREEZE_STRUCT_RE = re.compile(r'STRUCT=(\w+)')
+_FREEZE_RAW_RE = re.compile(r'RAW_FROZEN=(\w+)')
+_FREEZE_FINAL_RE = re.compile(r'FINAL_FROZEN=(\w+)')
+_FREEZE_CONFLICT_RE = re.compile(r'conflict=(\d)')
+
+_PHASE_DIST_PATTERNS = [
+    (re.compile(r'ROT=(\d+\.?\d*)%'), 'rotation'),
+    (re.compile(r'TEST=(\d+\.?\d*)%'), 'testing'),
+    (re.compile(r'TREND=(\d+\.?\d*)%'), 'trending'),
+    (re.compile(r'EXT=(\d+\.?\d*)%'), 'extension'),
+    (re.compile(r'PULL=(\d+\.?\d*)%'), 'pullback'),
+    (re.compile(r'FAIL=(\d+\.?\d*)%'), 'failed'),
+]
+
+_TRANSITION_PATTERNS = [
+    (re.compile(r'Session=(\d+)'), 'session'),
+    (re.compile(r'Phase=(\d+)'), 'phase'),
+    (re.compile(r'State=(\d+)'), 'state'),
+]
+
+# Use non-greedy .*? to capture the FIRST CONF= after each marker
+_REGIME_PHASE_PATTERNS = [
+    (re.compile(r'REGIME:.*?CONF=(\w+)'), 'regime_conf'),
+    (re.compile(r'PHASE:.*?CONF=(\w+)'), 'phase_conf'),
+]
+
+_STRUCT_RANGE_RE = re.compile(r'RANGE_T=(\d+)')
+_VA_RANGE_RE = re.compile(r'Range=(\d+)')
+_BAR_RE = re.compile(r'Bar\s+(\d+)')
+_SESS_RE = re.compile(r'SESS=(\w+)')
+# New format first, then legacy (greedy .* keeps the last bal= on the line)
+_MARKET_STATE_RE = re.compile(r'Market State:\s+(?P<state>\w+)'
+                              r'(?:\s+str=(?P<strength>[\d.]+)\s+bars=(?P<bars>\d+)|.*bal=(?P<bal>\d+)%)')
+
+# AuctionRegime name -> slot in the per-session regime count list
+_REGIME_IDX = {'BALANCE': 0, 'TRANSITION': 1, 'IMBALANCE': 2,
+               'FAILED_AUCTION': 3, 'EXCESS': 4, 'REBALANCE': 5}
+
+# slots=True (3.10+) drops the per-instance __dict__; older interpreters get a plain dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class SessionStats:
     """Holds calibration metrics for one session."""
     session_date: str = ""
@@ -54,6 +113,10 @@ class SessionStats:
     market_state_balance_count: int = 0
     market_state_imbalance_count: int = 0
 
+    # Observation totals (derived; denominators for the per-session percentages)
+    regime_total: int = 0
+    market_state_total: int = 0
+
     # Key events
     pullback_events: int = 0
     acceptance_events: int = 0  # IMBALANCE transitions
@@ -81,27 +144,27 @@ def parse_shape_freeze(line: str) -> Dict[str, any]:
     result = {}
 
     # Extract freeze bar
-    match = re.search(r't_freeze=(\d+)', line)
+    match = _FREEZE_BAR_RE.search(line)
     if match:
         result['freeze_bar'] = int(match.group(1))
 
     # Extract structure
-    match = re.search(r'STRUCT=(\w+)', line)
+    match = _FREEZE_STRUCT_RE.search(line)
     if match:
         result['structure'] = match.group(1)
 
     # Extract raw frozen shape
-    match = re.search(r'RAW_FROZEN=(\w+)', line)
+    match = _FREEZE_RAW_RE.search(line)
     if match:
         result['raw_frozen'] = match.group(1)
 
     # Extract final frozen shape
-    match = re.search(r'FINAL_FROZEN=(\w+)', line)
+    match = _FREEZE_FINAL_RE.search(line)
     if match:
         result['final_frozen'] = match.group(1)
 
     # Extract conflict flag
-    match = re.search(r'conflict=(\d)', line)
+    match = _FREEZE_CONFLICT_RE.search(line)
     if match:
         result['conflict'] = match.group(1) == '1'
 
@@ -111,16 +174,8 @@ def parse_shape_freeze(line: str) -> Dict[str, any]:
 def parse_phase_distribution(line: str) -> Dict[str, float]:
     """Parse: Phase Distribution: ROT=68.4% TEST=7.9% TREND=7.9% EXT=3.9% PULL=0.0% FAIL=10.5%"""
     result = {}
-    patterns = [
-        (r'ROT=(\d+\.?\d*)%', 'rotation'),
-        (r'TEST=(\d+\.?\d*)%', 'testing'),
-        (r'TREND=(\d+\.?\d*)%', 'trending'),
-        (r'EXT=(\d+\.?\d*)%', 'extension'),
-        (r'PULL=(\d+\.?\d*)%', 'pullback'),
-        (r'FAIL=(\d+\.?\d*)%', 'failed'),
-    ]
-    for pattern, key in patterns:
-        match = re.search(pattern, line)
+    for pattern, key in _PHASE_DIST_PATTERNS:
+        match = pattern.search(line)
         if match:
             result[key] = float(match.group(1))
     return result
@@ -129,13 +184,8 @@ def parse_phase_distribution(line: str) -> Dict[str, float]:
 def parse_transitions(line: str) -> Dict[str, int]:
     """Parse: Transitions: Session=1 Phase=9 State=0"""
     result = {}
-    patterns = [
-        (r'Session=(\d+)', 'session'),
-        (r'Phase=(\d+)', 'phase'),
-        (r'State=(\d+)', 'state'),
-    ]
-    for pattern, key in patterns:
-        match = re.search(pattern, line)
+    for pattern, key in _TRANSITION_PATTERNS:
+        match = pattern.search(line)
         if match:
             result[key] = int(match.group(1))
     return result
@@ -144,13 +194,8 @@ def parse_transitions(line: str) -> Dict[str, int]:
 def parse_regime_phase(line: str) -> Dict[str, str]:
     """Parse: REGIME: RAW=FAILED_AUCTION CONF=TRANSITION | PHASE: RAW=... CONF=..."""
     result = {}
-    # Use non-greedy .*? to capture the FIRST CONF= after each marker
-    patterns = [
-        (r'REGIME:.*?CONF=(\w+)', 'regime_conf'),
-        (r'PHASE:.*?CONF=(\w+)', 'phase_conf'),
-    ]
-    for pattern, key in patterns:
-        match = re.search(pattern, line)
+    for pattern, key in _REGIME_PHASE_PATTERNS:
+        match = pattern.search(line)
         if match:
             result[key] = match.group(1)
     return result
@@ -159,7 +204,7 @@ def parse_regime_phase(line: str) -> Dict[str, str]:
 def parse_struct(line: str) -> Dict[str, int]:
     """Parse: Struct: SESS_HI=... RANGE_T=97"""
     result = {}
-    match = re.search(r'RANGE_T=(\d+)', line)
+    match = _STRUCT_RANGE_RE.search(line)
     if match:
         result['range_ticks'] = int(match.group(1))
     return result
@@ -168,7 +213,7 @@ def parse_struct(line: str) -> Dict[str, int]:
 def parse_va(line: str) -> Dict[str, int]:
     """Parse: VA: POC=... Range=40 ticks"""
     result = {}
-    match = re.search(r'Range=(\d+)', line)
+    match = _VA_RANGE_RE.search(line)
     if match:
         result['va_range'] = int(match.group(1))
     return result
@@ -176,7 +221,7 @@ def parse_va(line: str) -> Dict[str, int]:
 
 def parse_bar_number(line: str) -> Optional[int]:
     """Extract bar number from: Bar 6333 |"""
-    match = re.search(r'Bar\s+(\d+)', line)
+    match = _BAR_RE.search(line)
     if match:
         return int(match.group(1))
     return None
@@ -184,7 +229,7 @@ def parse_bar_number(line: str) -> Optional[int]:
 
 def parse_session_phase(line: str) -> Optional[str]:
     """Extract session phase from: SESS=MID_SESS"""
-    match = re.search(r'SESS=(\w+)', line)
+    match = _SESS_RE.search(line)
     if match:
         return match.group(1)
     return None
@@ -194,28 +239,30 @@ def parse_market_state(line: str) -> Dict[str, any]:
     """Parse: Market State: IMBALANCE str=0.20 bars=1
        or legacy: Market State: BALANCE (sess=4771, bal=100%)"""
     result = {}
-    # New format: Market State: IMBALANCE str=0.20 bars=1
-    match = re.search(r'Market State:\s+(\w+)\s+str=([\d.]+)\s+bars=(\d+)', line)
-    if match:
-        result['state'] = match.group(1)
-        result['strength'] = float(match.group(2))
-        result['consecutive_bars'] = int(match.group(3))
-        # Derive balance_pct from state (for backward compat)
-        result['balance_pct'] = 100.0 if match.group(1) == 'BALANCE' else 0.0
+    match = _MARKET_STATE_RE.search(line)
+    if match is None:
         return result
-    # Legacy format: Market State: BALANCE (sess=4771, bal=100%)
-    match = re.search(r'Market State:\s+(\w+).*bal=(\d+)%', line)
-    if match:
-        result['state'] = match.group(1)
-        result['balance_pct'] = float(match.group(2))
+    state = match.group('state')
+    result['state'] = state
+    if match.group('strength') is not None:
+        # New format: Market State: IMBALANCE str=0.20 bars=1
+        result['strength'] = float(match.group('strength'))
+        result['consecutive_bars'] = int(match.group('bars'))
+        # Derive balance_pct from state (for backward compat)
+        result['balance_pct'] = 100.0 if state == 'BALANCE' else 0.0
+    else:
+        # Legacy format: Market State: BALANCE (sess=4771, bal=100%)
+        result['balance_pct'] = float(match.group('bal'))
     return result
 
 
 def parse_date(line: str) -> Optional[str]:
     """Extract date from log line: 2025-12-29  10:35:59.598"""
-    match = re.match(r'(\d{4}-\d{2}-\d{2})', line)
-    if match:
-        return match.group(1)
+    # Fixed-offset YYYY-MM-DD prefix; isdecimal() matches exactly what \d does
+    date = line[:10]
+    if (len(date) == 10 and date[4] == '-' and date[7] == '-' and
+            date[:4].isdecimal() and date[5:7].isdecimal() and date[8:].isdecimal()):
+        return date
     return None
 
 
@@ -234,16 +281,18 @@ def detect_session_boundaries(lines: List[str]) -> List[tuple]:
     last_bar = -1
 
     for i, line in enumerate(lines):
-        date = parse_date(line)
         bar = parse_bar_number(line)
 
         # Detect session boundary
         is_boundary = False
 
-        if date and date != current_date:
-            if current_date is not None:
-                is_boundary = True
-            current_date = date
+        # Lines stamped with the current date cannot start a new one; skip the regex
+        if current_date is None or not line.startswith(current_date):
+            date = parse_date(line)
+            if date and date != current_date:
+                if current_date is not None:
+                    is_boundary = True
+                current_date = date
 
         if bar is not None and bar < last_bar - 100:  # Bar reset detection
             is_boundary = True
@@ -266,9 +315,8 @@ def extract_session_stats(lines: List[str], start_idx: int, end_idx: int) -> Ses
     """Extract stats from a session's log lines."""
     stats = SessionStats()
 
-    # Track regime/phase counts (AuctionRegime - all 6 values)
-    regime_counts = {'BALANCE': 0, 'TRANSITION': 0, 'IMBALANCE': 0,
-                     'FAILED_AUCTION': 0, 'EXCESS': 0, 'REBALANCE': 0}
+    # Track regime/phase counts (AuctionRegime - all 6 values, indexed by _REGIME_IDX)
+    regime_counts = [0] * len(_REGIME_IDX)
     # Track Market State counts (AMTMarketState - SSOT)
     market_state_counts = {'BALANCE': 0, 'IMBALANCE': 0}
     phase_counts = {'PULLBACK': 0, 'RANGE_EXTENSION': 0}
@@ -295,8 +343,13 @@ def extract_session_stats(lines: List[str], start_idx: int, end_idx: int) -> Ses
         if sess_phase:
             stats.session_type = sess_phase
 
+        # One scan for every section tag on the line; most lines carry none
+        sections = _SECTION_RE.findall(line)
+        if not sections:
+            continue
+
         # Phase distribution (take last value)
-        if 'Phase Distribution:' in line:
+        if 'Phase Distribution:' in sections:
             dist = parse_phase_distribution(line)
             stats.pct_rotation = dist.get('rotation', 0)
             stats.pct_testing = dist.get('testing', 0)
@@ -306,20 +359,21 @@ def extract_session_stats(lines: List[str], start_idx: int, end_idx: int) -> Ses
             stats.pct_failed = dist.get('failed', 0)
 
         # Transitions (take last value)
-        if 'Transitions:' in line:
+        if 'Transitions:' in sections:
             trans = parse_transitions(line)
             stats.session_transitions = trans.get('session', 0)
             stats.phase_transitions = trans.get('phase', 0)
             stats.state_transitions = trans.get('state', 0)
 
         # Regime/Phase counts
-        if 'REGIME:' in line and 'CONF=' in line:
+        if 'REGIME:' in sections and 'CONF=' in line:
             rp = parse_regime_phase(line)
             regime = rp.get('regime_conf', '')
             phase = rp.get('phase_conf', '')
 
-            if regime in regime_counts:
-                regime_counts[regime] += 1
+            idx = _REGIME_IDX.get(regime, -1)
+            if idx >= 0:
+                regime_counts[idx] += 1
 
             # Track IMBALANCE transitions (acceptance events)
             if regime == 'IMBALANCE' and prev_regime != 'IMBALANCE':
@@ -330,17 +384,17 @@ def extract_session_stats(lines: List[str], start_idx: int, end_idx: int) -> Ses
                 phase_counts[phase] += 1
 
         # Structure
-        if 'Struct:' in line and 'RANGE_T=' in line:
+        if 'Struct:' in sections and 'RANGE_T=' in line:
             struct = parse_struct(line)
             stats.session_range_ticks = struct.get('range_ticks', 0)
 
         # VA
-        if 'VA:' in line and 'Range=' in line:
+        if 'VA:' in sections and 'Range=' in line:
             va = parse_va(line)
             stats.va_range_ticks = va.get('va_range', 0)
 
         # Market state (AMTMarketState - SSOT)
-        if 'Market State:' in line:
+        if 'Market State:' in sections:
             ms = parse_market_state(line)
             state = ms.get('state', '')
             stats.market_state = state
@@ -351,7 +405,7 @@ def extract_session_stats(lines: List[str], start_idx: int, end_idx: int) -> Ses
 
         # Shape freeze (ONE per session - this is the SSOT)
         # Only take the first SHAPE_FREEZE found (should be unique per session)
-        if 'SHAPE_FREEZE:' in line and not stats.shape_frozen:
+        if 'SHAPE_FREEZE:' in sections and not stats.shape_frozen:
             sf = parse_shape_freeze(line)
             stats.shape_freeze_bar = sf.get('freeze_bar', 0)
             stats.shape_day_structure = sf.get('structure', '')
@@ -361,16 +415,14 @@ def extract_session_stats(lines: List[str], start_idx: int, end_idx: int) -> Ses
             stats.shape_frozen = True
 
     # Set regime counts (AuctionRegime - legacy)
-    stats.regime_balance_count = regime_counts['BALANCE']
-    stats.regime_transition_count = regime_counts['TRANSITION']
-    stats.regime_imbalance_count = regime_counts['IMBALANCE']
-    stats.regime_failed_count = regime_counts['FAILED_AUCTION']
-    stats.regime_excess_count = regime_counts['EXCESS']
-    stats.regime_rebalance_count = regime_counts['REBALANCE']
+    (stats.regime_balance_count, stats.regime_transition_count, stats.regime_imbalance_count,
+     stats.regime_failed_count, stats.regime_excess_count, stats.regime_rebalance_count) = regime_counts
+    stats.regime_total = sum(regime_counts)
 
     # Set Market State counts (AMTMarketState - SSOT)
     stats.market_state_balance_count = market_state_counts['BALANCE']
     stats.market_state_imbalance_count = market_state_counts['IMBALANCE']
+    stats.market_state_total = stats.market_state_balance_count + stats.market_state_imbalance_count
 
     # Set event counts
     stats.pullback_events = phase_counts['PULLBACK']
@@ -388,6 +440,11 @@ def extract_session_stats(lines: List[str], start_idx: int, end_idx: int) -> Ses
     return stats
 
 
+def extract_session_window(window: List[str]) -> SessionStats:
+    """Extract stats from one pre-sliced session window (process pool worker)."""
+    return extract_session_stats(window, 0, len(window) - 1)
+
+
 def classify_session(stats: SessionStats) -> str:
     """Classify session as Balance, Trend, or Mixed based on metrics."""
     # High rotation + low trending = balance
@@ -404,133 +461,119 @@ def classify_session(stats: SessionStats) -> str:
         return "MIXED"
 
 
-def generate_report(sessions: List[SessionStats]) -> str:
-    """Generate calibration report."""
-    lines = []
-    lines.append("=" * 80)
-    lines.append("PHASE SYSTEM v2 - CALIBRATION REPORT")
-    lines.append("=" * 80)
-    lines.append("")
-    lines.append(f"Sessions analyzed: {len(sessions)}")
-    lines.append("")
+# Phase percentages averaged in the aggregate section, in report order
+_PHASE_PCT_GETTER = attrgetter('pct_rotation', 'pct_testing', 'pct_trending',
+                               'pct_extension', 'pct_pullback', 'pct_failed')
+
+# Report line templates (hoisted out of the per-session loop)
+_SESSION_HDR_TMPL = "SESSION {}: {} ({})"
+_BARS_TMPL = "  Bars: {}-{} ({} bars)"
+_RANGE_TMPL = "  Range: {}t | VA: {}t"
+_PHASE_ROW1_TMPL = "    ROT={:5.1f}%  TEST={:5.1f}%  TREND={:5.1f}%"
+_PHASE_ROW2_TMPL = "    EXT={:5.1f}%  PULL={:5.1f}%  FAIL={:5.1f}%"
+_OUT_BAL_TMPL = "    OUT_BAL={:5.1f}% (derived)"
+_COUNT_PCT_TMPL = "    {}={} ({:.1f}%)"
+
+
+def _iter_report_lines(sessions: List[SessionStats]) -> Iterator[str]:
+    """Yield calibration report lines one at a time."""
+    yield "=" * 80
+    yield "PHASE SYSTEM v2 - CALIBRATION REPORT"
+    yield "=" * 80
+    yield ""
+    yield f"Sessions analyzed: {len(sessions)}"
+    yield ""
 
     # Per-session summary
-    lines.append("-" * 80)
-    lines.append("PER-SESSION METRICS")
-    lines.append("-" * 80)
-    lines.append("")
-
-    for i, s in enumerate(sessions, 1):
-        classification = classify_session(s)
-        lines.append(f"SESSION {i}: {s.session_date} ({classification})")
-        lines.append(f"  Bars: {s.first_bar}-{s.last_bar} ({s.total_bars} bars)")
-        lines.append(f"  Range: {s.session_range_ticks}t | VA: {s.va_range_ticks}t")
-        lines.append("")
-        lines.append(f"  PHASE DISTRIBUTION:")
-        lines.append(f"    ROT={s.pct_rotation:5.1f}%  TEST={s.pct_testing:5.1f}%  TREND={s.pct_trending:5.1f}%")
-        lines.append(f"    EXT={s.pct_extension:5.1f}%  PULL={s.pct_pullback:5.1f}%  FAIL={s.pct_failed:5.1f}%")
-        lines.append(f"    OUT_BAL={s.pct_outside_balance:5.1f}% (derived)")
-        lines.append("")
+    yield "-" * 80
+    yield "PER-SESSION METRICS"
+    yield "-" * 80
+    yield ""
+
+    # Classify once; shared by the per-session headers and the breakdown
+    classifications = [classify_session(s) for s in sessions]
+
+    for i, (s, classification) in enumerate(zip(sessions, classifications), 1):
+        yield _SESSION_HDR_TMPL.format(i, s.session_date, classification)
+        yield _BARS_TMPL.format(s.first_bar, s.last_bar, s.total_bars)
+        yield _RANGE_TMPL.format(s.session_range_ticks, s.va_range_ticks)
+        yield ""
+        yield f"  PHASE DISTRIBUTION:"
+        yield _PHASE_ROW1_TMPL.format(s.pct_rotation, s.pct_testing, s.pct_trending)
+        yield _PHASE_ROW2_TMPL.format(s.pct_extension, s.pct_pullback, s.pct_failed)
+        yield _OUT_BAL_TMPL.format(s.pct_outside_balance)
+        yield ""
         # Market State (AMTMarketState - SSOT)
-        lines.append(f"  MARKET STATE (AMTMarketState):")
-        total_ms = s.market_state_balance_count + s.market_state_imbalance_count
+        yield f"  MARKET STATE (AMTMarketState):"
+        total_ms = s.market_state_total
         if total_ms > 0:
-            lines.append(f"    BALANCE={s.market_state_balance_count} ({100*s.market_state_balance_count/total_ms:.1f}%)")
-            lines.append(f"    IMBALANCE={s.market_state_imbalance_count} ({100*s.market_state_imbalance_count/total_ms:.1f}%)")
+            yield _COUNT_PCT_TMPL.format("BALANCE", s.market_state_balance_count, 100 * s.market_state_balance_count / total_ms)
+            yield _COUNT_PCT_TMPL.format("IMBALANCE", s.market_state_imbalance_count, 100 * s.market_state_imbalance_count / total_ms)
         else:
-            lines.append(f"    (no Market State data)")
+            yield f"    (no Market State data)"
 
         # Regime (AuctionRegime - legacy four-phase)
-        lines.append(f"  REGIME (AuctionRegime - legacy):")
-        total_regime = (s.regime_balance_count + s.regime_transition_count + s.regime_imbalance_count +
-                       s.regime_failed_count + s.regime_excess_count + s.regime_rebalance_count)
+        yield f"  REGIME (AuctionRegime - legacy):"
+        total_regime = s.regime_total
         if total_regime > 0:
-            lines.append(f"    BALANCE={s.regime_balance_count} ({100*s.regime_balance_count/total_regime:.1f}%)")
-            lines.append(f"    TRANSITION={s.regime_transition_count} ({100*s.regime_transition_count/total_regime:.1f}%)")
-            lines.append(f"    IMBALANCE={s.regime_imbalance_count} ({100*s.regime_imbalance_count/total_regime:.1f}%)")
-            lines.append(f"    EXCESS={s.regime_excess_count} ({100*s.regime_excess_count/total_regime:.1f}%)")
-            lines.append(f"    REBALANCE={s.regime_rebalance_count} ({100*s.regime_rebalance_count/total_regime:.1f}%)")
-            lines.append(f"    FAILED={s.regime_failed_count} ({100*s.regime_failed_count/total_regime:.1f}%)")
-        lines.append("")
-        lines.append(f"  TRANSITIONS: Phase={s.phase_transitions}")
-        lines.append(f"  EVENTS: Pullback={s.pullback_events} | Acceptance={s.acceptance_events} | RangeExt={s.range_ext_events}")
-        lines.append(f"  STATE: {s.market_state} (bal={s.balance_pct:.0f}%)")
+            yield _COUNT_PCT_TMPL.format("BALANCE", s.regime_balance_count, 100 * s.regime_balance_count / total_regime)
+            yield _COUNT_PCT_TMPL.format("TRANSITION", s.regime_transition_count, 100 * s.regime_transition_count / total_regime)
+            yield _COUNT_PCT_TMPL.format("IMBALANCE", s.regime_imbalance_count, 100 * s.regime_imbalance_count / total_regime)
+            yield _COUNT_PCT_TMPL.format("EXCESS", s.regime_excess_count, 100 * s.regime_excess_count / total_regime)
+            yield _COUNT_PCT_TMPL.format("REBALANCE", s.regime_rebalance_count, 100 * s.regime_rebalance_count / total_regime)
+            yield _COUNT_PCT_TMPL.format("FAILED", s.regime_failed_count, 100 * s.regime_failed_count / total_regime)
+        yield ""
+        yield f"  TRANSITIONS: Phase={s.phase_transitions}"
+        yield f"  EVENTS: Pullback={s.pullback_events} | Acceptance={s.acceptance_events} | RangeExt={s.range_ext_events}"
+        yield f"  STATE: {s.market_state} (bal={s.balance_pct:.0f}%)"
         # Shape freeze (session-level SSOT)
         if s.shape_frozen:
             conflict_str = " [CONFLICT]" if s.shape_conflict else ""
-            lines.append(f"  SHAPE_FREEZE: t={s.shape_freeze_bar} STRUCT={s.shape_day_structure} "
-                        f"RAW={s.shape_raw_frozen} FINAL={s.shape_final_frozen}{conflict_str}")
+            yield (f"  SHAPE_FREEZE: t={s.shape_freeze_bar} STRUCT={s.shape_day_structure} "
+                   f"RAW={s.shape_raw_frozen} FINAL={s.shape_final_frozen}{conflict_str}")
         else:
-            lines.append(f"  SHAPE_FREEZE: (not frozen)")
-        lines.append("")
+            yield f"  SHAPE_FREEZE: (not frozen)"
+        yield ""
 
     # Aggregate metrics
-    lines.append("-" * 80)
-    lines.append("AGGREGATE METRICS")
-    lines.append("-" * 80)
-    lines.append("")
+    yield "-" * 80
+    yield "AGGREGATE METRICS"
+    yield "-" * 80
+    yield ""
+
+    # Concerns are flagged as soon as the aggregates they read are known
+    concerns = []
 
     n = len(sessions)
     if n > 0:
-        avg_rot = sum(s.pct_rotation for s in sessions) / n
-        avg_test = sum(s.pct_testing for s in sessions) / n
-        avg_trend = sum(s.pct_trending for s in sessions) / n
-        avg_ext = sum(s.pct_extension for s in sessions) / n
-        avg_pull = sum(s.pct_pullback for s in sessions) / n
-        avg_fail = sum(s.pct_failed for s in sessions) / n
-
-        lines.append(f"  AVG PHASE DISTRIBUTION:")
-        lines.append(f"    ROT={avg_rot:5.1f}%  TEST={avg_test:5.1f}%  TREND={avg_trend:5.1f}%")
-        lines.append(f"    EXT={avg_ext:5.1f}%  PULL={avg_pull:5.1f}%  FAIL={avg_fail:5.1f}%")
-        lines.append("")
-
-        avg_phase_trans = sum(s.phase_transitions for s in sessions) / n
+        # One pass over sessions; zip(*) transposes rows into per-phase columns
+        avg_rot, avg_test, avg_trend, avg_ext, avg_pull, avg_fail = (
+            sum(col) / n for col in zip(*map(_PHASE_PCT_GETTER, sessions)))
+
+        yield f"  AVG PHASE DISTRIBUTION:"
+        yield _PHASE_ROW1_TMPL.format(avg_rot, avg_test, avg_trend)
+        yield _PHASE_ROW2_TMPL.format(avg_ext, avg_pull, avg_fail)
+        yield ""
+
+        avg_phase_trans = sum(map(attrgetter('phase_transitions'), sessions)) / n
         pullback_sessions = sum(1 for s in sessions if s.pullback_events > 0)
         acceptance_sessions = sum(1 for s in sessions if s.acceptance_events > 0)
 
-        lines.append(f"  AVG PHASE TRANSITIONS: {avg_phase_trans:.1f} per session")
-        lines.append(f"  PULLBACK REACHABILITY: {pullback_sessions}/{n} sessions ({100*pullback_sessions/n:.0f}%)")
-        lines.append(f"  ACCEPTANCE EVENTS: {acceptance_sessions}/{n} sessions ({100*acceptance_sessions/n:.0f}%)")
-        lines.append("")
+        yield f"  AVG PHASE TRANSITIONS: {avg_phase_trans:.1f} per session"
+        yield f"  PULLBACK REACHABILITY: {pullback_sessions}/{n} sessions ({100 * pullback_sessions / n:.0f}%)"
+        yield f"  ACCEPTANCE EVENTS: {acceptance_sessions}/{n} sessions ({100 * acceptance_sessions / n:.0f}%)"
+        yield ""
 
         # Classification breakdown
-        balance_count = sum(1 for s in sessions if classify_session(s) == "BALANCE")
-        trend_count = sum(1 for s in sessions if classify_session(s) == "TREND")
-        mixed_count = sum(1 for s in sessions if classify_session(s) == "MIXED")
-
-        lines.append(f"  SESSION TYPES: Balance={balance_count} Trend={trend_count} Mixed={mixed_count}")
-        lines.append("")
-
-        # Shape distribution (SESSION-LEVEL - counts one per session, NOT per bar)
-        lines.append("  SHAPE DISTRIBUTION (session-level, 1 per session):")
-        frozen_sessions = [s for s in sessions if s.shape_frozen]
-        if frozen_sessions:
-            # Count final shapes
-            shape_counts = {}
-            conflict_count = 0
-            for s in frozen_sessions:
-                shape = s.shape_final_frozen if s.shape_final_frozen else "UNDEFINED"
-                shape_counts[shape] = shape_counts.get(shape, 0) + 1
-                if s.shape_conflict:
-                    conflict_count += 1
-
-            for shape, count in sorted(shape_counts.items(), key=lambda x: -x[1]):
-                pct = 100 * count / len(frozen_sessions)
-                lines.append(f"    {shape}={count} ({pct:.1f}%)")
-            lines.append(f"    CONFLICT_RATE={conflict_count}/{len(frozen_sessions)} ({100*conflict_count/len(frozen_sessions):.1f}%)")
-        else:
-            lines.append(f"    (no SHAPE_FREEZE events found)")
-
-    lines.append("")
-    lines.append("-" * 80)
-    lines.append("CALIBRATION CONCERNS")
-    lines.append("-" * 80)
-    lines.append("")
+        class_counts = Counter(classifications)
+        balance_count = class_counts["BALANCE"]
+        trend_count = class_counts["TREND"]
+        mixed_count = class_counts["MIXED"]
 
-    # Flag issues
-    concerns = []
+        yield f"  SESSION TYPES: Balance={balance_count} Trend={trend_count} Mixed={mixed_count}"
+        yield ""
 
-    if n > 0:
+        # Flag issues
         if avg_pull < 1.0:
             concerns.append("- PULLBACK never/rarely fires. Consider reducing directionalAfterglowBars or approachingPOCLookback.")
 
@@ -546,77 +589,145 @@ def generate_report(sessions: List[SessionStats]) -> str:
         if acceptance_sessions == 0:
             concerns.append("- No IMBALANCE/acceptance events. acceptanceClosesRequired may be too high.")
 
+        # Shape distribution (SESSION-LEVEL - counts one per session, NOT per bar)
+        yield "  SHAPE DISTRIBUTION (session-level, 1 per session):"
+        frozen_sessions = [s for s in sessions if s.shape_frozen]
+        if frozen_sessions:
+            # Count final shapes
+            shape_counts = Counter(s.shape_final_frozen or "UNDEFINED" for s in frozen_sessions)
+            conflict_count = sum(1 for s in frozen_sessions if s.shape_conflict)
+
+            n_frozen = len(frozen_sessions)
+            for shape, count in shape_counts.most_common():
+                yield _COUNT_PCT_TMPL.format(shape, count, 100 * count / n_frozen)
+            yield f"    CONFLICT_RATE={conflict_count}/{n_frozen} ({100 * conflict_count / n_frozen:.1f}%)"
+        else:
+            yield f"    (no SHAPE_FREEZE events found)"
+
+    yield ""
+    yield "-" * 80
+    yield "CALIBRATION CONCERNS"
+    yield "-" * 80
+    yield ""
+
     if not concerns:
         concerns.append("- No major concerns detected. Review individual sessions for edge cases.")
 
-    for c in concerns:
-        lines.append(c)
+    yield from concerns
+
+    yield ""
+    yield "=" * 80
+
 
-    lines.append("")
-    lines.append("=" * 80)
+def generate_report(sessions: List[SessionStats]) -> str:
+    """Generate calibration report."""
+    return "\n".join(_iter_report_lines(sessions))
 
-    return "\n".join(lines)
 
+def write_report_stream(sessions: List[SessionStats], fp: TextIO) -> None:
+    """Write the calibration report to fp without building it in memory."""
+    first = True
+    for line in _iter_report_lines(sessions):
+        if not first:
+            fp.write("\n")
+        fp.write(line)
+        first = False
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python extract_session_stats.py <logfile.txt> [--output report.txt]")
-        print("")
-        print("Input: Copy Sierra Chart log window contents to a text file")
-        print("       (Select all in Log window, Ctrl+C, paste to Notepad, save)")
-        sys.exit(1)
 
-    input_file = sys.argv[1]
-    output_file = None
+def read_tagged_lines(path: str) -> Tuple[int, List[str]]:
+    """Return (total line count, stripped AMT/SESSION lines) for a log file.
+
+    Scans a read-only memory map with a bytes regex so only the kept lines
+    are ever decoded. Lines end at CRLF, CR or LF, as in text-mode reading.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file cannot be mapped
+            return 0, []
+
+    with mm:
+        size = len(mm)
+        total_lines = 0
+        chunk = 1 << 20
+        for off in range(0, size, chunk):
+            block = mm[off:off + chunk + 1]  # One byte of overlap to see \r\n across chunks
+            total_lines += (block.count(b'\n', 0, chunk) + block.count(b'\r', 0, chunk)
+                            - block.count(b'\r\n'))
+        if size and mm[size - 1] not in (0x0A, 0x0D):
+            total_lines += 1  # Unterminated last line
+
+        tagged = []
+        search = _TAG_RE.search
+        eol_search = _EOL_RE.search
+        pos = 0
+        while True:
+            m = search(mm, pos)
+            if m is None:
+                break
+            start = max(mm.rfind(b'\n', 0, m.start()), mm.rfind(b'\r', 0, m.start())) + 1
+            eol = eol_search(mm, m.end())
+            end, pos = (eol.start(), eol.end()) if eol else (size, size)
+            tagged.append(mm[start:end].decode('utf-8', 'ignore').strip())
+
+    return total_lines, tagged
 
-    if '--output' in sys.argv:
-        idx = sys.argv.index('--output')
-        if idx + 1 < len(sys.argv):
-            output_file = sys.argv[idx + 1]
 
-    # Read input
+def main():
+    parser = argparse.ArgumentParser(
+        description="Extract per-session Phase System v2 calibration metrics from a Sierra Chart log.",
+        epilog="Input: Copy Sierra Chart log window contents to a text file "
+               "(Select all in Log window, Ctrl+C, paste to Notepad, save)")
+    parser.add_argument('input', help="log file (.txt)")
+    parser.add_argument('--output', help="write the report to this file instead of stdout")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="extract sessions in N worker processes (default 1)")
+    args = parser.parse_args()
+
+    input_file = args.input
+    output_file = args.output
+    jobs = max(1, args.jobs)
+
+    # Read input, keeping only AMT and SESSION lines (SHAPE_FREEZE uses [SESSION] tag)
     try:
-        with open(input_file, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
+        total_lines, amt_lines = read_tagged_lines(input_file)
     except FileNotFoundError:
         print(f"Error: File not found: {input_file}")
         sys.exit(1)
 
-    print(f"Read {len(lines)} lines from {input_file}")
-
-    # Filter to AMT and SESSION lines (SHAPE_FREEZE uses [SESSION] tag)
-    amt_lines = [l.strip() for l in lines if '[AMT]' in l or '[SESSION]' in l]
+    print(f"Read {total_lines} lines from {input_file}")
     print(f"Found {len(amt_lines)} AMT/SESSION log lines")
 
     if len(amt_lines) < 10:
         print("Warning: Very few AMT log lines found. Make sure the log contains AMT study output.")
-        # Try to process anyway with all lines
-        amt_lines = [l.strip() for l in lines]
+        # Try to process anyway with all lines (rare path: re-read rather than hold the whole log)
+        with open(input_file, 'r', encoding='utf-8', errors='ignore') as f:
+            amt_lines = [l.strip() for l in f]
 
     # Detect sessions
     sessions_bounds = detect_session_boundaries(amt_lines)
     print(f"Detected {len(sessions_bounds)} session(s)")
 
-    # Extract stats per session
-    all_stats = []
-    for start, end in sessions_bounds:
-        stats = extract_session_stats(amt_lines, start, end)
-        if stats.total_bars > 0:  # Only include non-empty sessions
-            all_stats.append(stats)
+    # Extract stats per session (windows are independent, so they can run in parallel)
+    if jobs > 1 and len(sessions_bounds) > 1:
+        windows = [amt_lines[start:end + 1] for start, end in sessions_bounds]
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            extracted = list(ex.map(extract_session_window, windows))
+    else:
+        extracted = [extract_session_stats(amt_lines, start, end) for start, end in sessions_bounds]
 
-    print(f"Extracted stats for {len(all_stats)} session(s)")
+    all_stats = [stats for stats in extracted if stats.total_bars > 0]  # Only include non-empty sessions
 
-    # Generate report
-    report = generate_report(all_stats)
+    print(f"Extracted stats for {len(all_stats)} session(s)")
 
-    # Output
+    # Generate report / output
     if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(report)
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 16) as f:  # 64 KiB: few large writes
+            write_report_stream(all_stats, f)
         print(f"Report written to: {output_file}")
     else:
         print("")
-        print(report)
+        sys.stdout.writelines(line + "\n" for line in _iter_report_lines(all_stats))
 
 
 if __name__ == "__main__":
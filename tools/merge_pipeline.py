@@ -22,7 +22,8 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple, Set
 from datetime import datetime
 from pathlib import Path
-from collections import defaultdict
+from operator import itemgetter
+from bisect import bisect_right, insort
 
 # =============================================================================
 # CONSTANTS (from Spec v1.1)
@@ -34,20 +35,117 @@ EVENT_TYPE_RANK = {
     'ENGAGEMENT_FINAL': 3
 }
 
-VALID_OUTCOMES = {'ACCEPT', 'REJECT', 'TAG', 'PROBE', 'TEST'}
-VALID_ZONE_TYPES = {'VPB_POC', 'VPB_VAH', 'VPB_VAL', 'PRIOR_POC', 'PRIOR_VAH', 'PRIOR_VAL', 'NONE', ''}
+VALID_OUTCOMES = frozenset({'ACCEPT', 'REJECT', 'TAG', 'PROBE', 'TEST'})
+VALID_ZONE_TYPES = frozenset({'VPB_POC', 'VPB_VAH', 'VPB_VAL', 'PRIOR_POC', 'PRIOR_VAH', 'PRIOR_VAL', 'NONE', ''})
 
 STALENESS_THRESHOLD = 50
 
-REQUIRED_COLUMNS = {
+REQUIRED_COLUMNS = frozenset({
     'session_id', 'session_type', 'ts', 'bar', 'event_type'
-}
+})
+
+# Fixed row layout used after load: input columns are mapped to these
+# positions once per file, so each row is a tuple indexed by COL_* constants.
+ROW_COLUMNS = (
+    'session_id', 'session_type', 'ts', 'bar', 'event_type',
+    'zone_id', 'zone_type', 'phase', 'message',
+    'aggression', 'facilitation', 'market_state',
+    'entry_price', 'exit_price', 'bars', 'outcome', 'escape_vel', 'vol_ratio'
+)
+(COL_SESSION_ID, COL_SESSION_TYPE, COL_TS, COL_BAR, COL_EVENT_TYPE,
+ COL_ZONE_ID, COL_ZONE_TYPE, COL_PHASE, COL_MESSAGE,
+ COL_AGGRESSION, COL_FACILITATION, COL_MARKET_STATE,
+ COL_ENTRY_PRICE, COL_EXIT_PRICE, COL_BARS, COL_OUTCOME, COL_ESCAPE_VEL, COL_VOL_RATIO) = range(len(ROW_COLUMNS))
+
+# Low-cardinality columns interned on load: they repeat on every row and
+# become dict/set keys during the merge
+INTERNED_COLUMNS = ('session_id', 'session_type', 'bar', 'event_type', 'zone_id', 'zone_type')
+
+# Parsed int(bar), appended after the ROW_COLUMNS fields on load (None if not an integer)
+COL_BAR_NUM = len(ROW_COLUMNS)
+
+# Value used when an optional column is absent from the input header
+ABSENT_COLUMN_DEFAULTS = {'entry_price': '0', 'exit_price': '0'}  # everything else: ''
+
+# Common spellings of a zero price, answered without float()
+_ZERO_PRICES = frozenset({'0', '0.0', '0.00', '-0', '-0.0'})
+
+
+def _is_zero_price(price: str) -> bool:
+    """Return True if price parses as zero; unparseable prices are not zero.
+
+    Plain prices led by a nonzero digit skip float(). An exponent can
+    underflow to zero ('1e-400'), so those still go through float().
+    """
+    if price in _ZERO_PRICES:
+        return True
+    if price and price[0] in '123456789' and 'e' not in price and 'E' not in price:
+        return False
+    try:
+        return float(price) == 0
+    except ValueError:
+        return False
+
+
+
+class _RawRow:
+    """Error raw_row payload, rendered only when the error is written.
+
+    str() reads the same as str() of the equivalent DictReader row.
+    """
+    __slots__ = ('header', 'raw')
+
+    def __init__(self, header: List[str], raw: List[str]):
+        self.header = header
+        self.raw = raw
+
+    def __str__(self) -> str:
+        header, raw = self.header, self.raw
+        row = dict(zip(header, raw))
+        if len(raw) > len(header):
+            row[None] = raw[len(header):]
+        else:
+            for name in header[len(raw):]:
+                row[name] = None
+        return str(row)
+
+# Output column order
+CONTEXT_FIELDS = (
+    'session_id', 'bar', 'session_type', 'ts', 'phase',
+    'zone_id_snapshot', 'zone_type_snapshot', 'aggression',
+    'facilitation', 'market_state', 'raw_state', 'snapshot_message',
+    'context_complete', '_source_rows'
+)
+
+ENGAGEMENT_FIELDS = (
+    'session_id', 'bar', 'ts', 'session_type', 'zone_id', 'zone_type',
+    'entry_price', 'exit_price', 'bars', 'outcome', 'escape_vel', 'vol_ratio',
+    'context_bar', 'context_stale', 'ctx_aggression', 'ctx_facilitation',
+    'ctx_market_state', 'ctx_phase', 'orphan', '_flags'
+)
+
+ERROR_FIELDS = (
+    'error_type', 'severity', 'session_id', 'bar', 'event_type',
+    'column_name', 'value_a', 'value_b', 'raw_row', 'ts_detected'
+)
+
+# Read/write buffer sizes for the CSV files
+INPUT_BUFFER_SIZE = 1 << 20
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# ContextRow._sources bits: which context event types contributed
+SOURCE_SNAPSHOT = 1
+SOURCE_LOCK = 2
+SOURCE_COMPLETE = SOURCE_SNAPSHOT | SOURCE_LOCK
+
+# slots=True (3.10+) drops the per-instance __dict__; older interpreters get a plain dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
 # =============================================================================
 # DATA CLASSES
 # =============================================================================
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Error:
     error_type: str
     severity: str  # 'FATAL' or 'RECOVERABLE'
@@ -57,24 +155,28 @@ class Error:
     column_name: Optional[str] = None
     value_a: Optional[str] = None
     value_b: Optional[str] = None
-    raw_row: Optional[str] = None
+    raw_row: Optional[object] = None  # str, or anything that renders via str() on write
+
+    def as_tuple(self) -> tuple:
+        """Values in ERROR_FIELDS order."""
+        return (
+            self.error_type,
+            self.severity,
+            self.session_id or '',
+            self.bar or '',
+            self.event_type or '',
+            self.column_name or '',
+            self.value_a or '',
+            self.value_b or '',
+            str(self.raw_row) if self.raw_row else '',
+            datetime.now().isoformat()
+        )
 
     def to_dict(self) -> dict:
-        return {
-            'error_type': self.error_type,
-            'severity': self.severity,
-            'session_id': self.session_id or '',
-            'bar': self.bar or '',
-            'event_type': self.event_type or '',
-            'column_name': self.column_name or '',
-            'value_a': self.value_a or '',
-            'value_b': self.value_b or '',
-            'raw_row': self.raw_row or '',
-            'ts_detected': datetime.now().isoformat()
-        }
+        return dict(zip(ERROR_FIELDS, self.as_tuple()))
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ContextRow:
     session_id: str
     bar: str
@@ -90,31 +192,35 @@ class ContextRow:
     snapshot_message: Optional[str] = None
     context_complete: bool = False
     _source_rows: int = 0
-
-    # Track which event types contributed
-    _has_snapshot: bool = False
-    _has_lock: bool = False
+    _bar_num: int = 0  # int(bar), parsed once on load
+
+    # Track which event types contributed (SOURCE_* bits)
+    _sources: int = 0
+
+    def as_tuple(self) -> tuple:
+        """Values in CONTEXT_FIELDS order."""
+        return (
+            self.session_id,
+            self.bar,
+            self.session_type,
+            self.ts,
+            self.phase or '',
+            self.zone_id_snapshot or '',
+            self.zone_type_snapshot or '',
+            self.aggression or '',
+            self.facilitation or '',
+            self.market_state or '',
+            self.raw_state or '',
+            self.snapshot_message or '',
+            'TRUE' if self.context_complete else 'FALSE',
+            str(self._source_rows)
+        )
 
     def to_dict(self) -> dict:
-        return {
-            'session_id': self.session_id,
-            'bar': self.bar,
-            'session_type': self.session_type,
-            'ts': self.ts,
-            'phase': self.phase or '',
-            'zone_id_snapshot': self.zone_id_snapshot or '',
-            'zone_type_snapshot': self.zone_type_snapshot or '',
-            'aggression': self.aggression or '',
-            'facilitation': self.facilitation or '',
-            'market_state': self.market_state or '',
-            'raw_state': self.raw_state or '',
-            'snapshot_message': self.snapshot_message or '',
-            'context_complete': 'TRUE' if self.context_complete else 'FALSE',
-            '_source_rows': str(self._source_rows)
-        }
+        return dict(zip(CONTEXT_FIELDS, self.as_tuple()))
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class EngagementRow:
     session_id: str
     bar: str
@@ -137,35 +243,39 @@ class EngagementRow:
     orphan: bool = False
     _flags: List[str] = field(default_factory=list)
 
-    def to_dict(self) -> dict:
+    def as_tuple(self) -> tuple:
+        """Values in ENGAGEMENT_FIELDS order."""
         # Handle context_stale: NULL if orphan, else TRUE/FALSE
         if self.orphan:
             stale_str = ''
         else:
             stale_str = 'TRUE' if self.context_stale else 'FALSE'
 
-        return {
-            'session_id': self.session_id,
-            'bar': self.bar,
-            'ts': self.ts,
-            'session_type': self.session_type,
-            'zone_id': self.zone_id,
-            'zone_type': self.zone_type,
-            'entry_price': self.entry_price,
-            'exit_price': self.exit_price,
-            'bars': self.bars,
-            'outcome': self.outcome,
-            'escape_vel': self.escape_vel,
-            'vol_ratio': self.vol_ratio,
-            'context_bar': self.context_bar or '',
-            'context_stale': stale_str,
-            'ctx_aggression': self.ctx_aggression or '',
-            'ctx_facilitation': self.ctx_facilitation or '',
-            'ctx_market_state': self.ctx_market_state or '',
-            'ctx_phase': self.ctx_phase or '',
-            'orphan': 'TRUE' if self.orphan else 'FALSE',
-            '_flags': ','.join(self._flags)
-        }
+        return (
+            self.session_id,
+            self.bar,
+            self.ts,
+            self.session_type,
+            self.zone_id,
+            self.zone_type,
+            self.entry_price,
+            self.exit_price,
+            self.bars,
+            self.outcome,
+            self.escape_vel,
+            self.vol_ratio,
+            self.context_bar or '',
+            stale_str,
+            self.ctx_aggression or '',
+            self.ctx_facilitation or '',
+            self.ctx_market_state or '',
+            self.ctx_phase or '',
+            'TRUE' if self.orphan else 'FALSE',
+            ','.join(self._flags)
+        )
+
+    def to_dict(self) -> dict:
+        return dict(zip(ENGAGEMENT_FIELDS, self.as_tuple()))
 
 
 # =============================================================================
@@ -173,10 +283,13 @@ class EngagementRow:
 # =============================================================================
 
 class MergePipeline:
-    def __init__(self, input_path: str, output_dir: str):
+    def __init__(self, input_path: str, output_dir: str, write_outputs: bool = True):
         self.input_path = input_path
         self.output_dir = Path(output_dir)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        # False keeps results in self.contexts/engagements/errors only (in-process callers)
+        self.write_outputs = write_outputs
+        if write_outputs:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
 
         self.errors: List[Error] = []
         self.contexts: List[ContextRow] = []
@@ -185,14 +298,26 @@ class MergePipeline:
         self.has_fatal = False
         self.has_recoverable = False
 
-        # For context lookup during merge
-        self.context_by_session_bar: Dict[Tuple[str, str], ContextRow] = {}
+        # Dense session index for packed (session_id, bar) keys, see _session_bar_key
+        self._session_index: Dict[str, int] = {}
+
+        # Merge state: context being built, and context events seen per
+        # session_bar_key for duplicate detection
+        self._current_context: Optional[ContextRow] = None
+        self._current_session_bar: Optional[int] = None
+        self._snapshot_seen: Set[int] = set()
+        self._lock_seen: Set[int] = set()
+
+        # For context lookup during merge: per-session sorted context bars
+        # + bar -> context, for bisect lookup
+        self._ctx_bars_by_session: Dict[str, List[int]] = {}
+        self._ctx_by_session: Dict[str, Dict[int, ContextRow]] = {}
 
         # For zone_type consistency check
         self.zone_type_by_id: Dict[Tuple[str, str], str] = {}  # (session_id, zone_id) -> zone_type
 
         # For duplicate engagement detection
-        self.seen_engagements: Set[Tuple[str, str, str]] = set()  # (session_id, bar, zone_id)
+        self.seen_engagements: Set[Tuple[int, str]] = set()  # (session_bar_key, zone_id)
 
         # Summary stats
         self.summary = {
@@ -230,17 +355,10 @@ class MergePipeline:
 
             rows = self._deduplicate(rows)
 
-            if not self._validate_sort_order(rows):
-                self._write_outputs()
-                return 3
-
-            if not self._validate_timestamps(rows):
-                self._write_outputs()
-                return 2
-
-            if not self._validate_zone_consistency(rows):
+            status = self._validate_rows(rows)
+            if status:
                 self._write_outputs()
-                return 2
+                return status
 
             # Phase 1: Single-pass merge
             self._merge(rows)
@@ -269,16 +387,22 @@ class MergePipeline:
     # PHASE 0: PRE-VALIDATION
     # =========================================================================
 
-    def _load_input(self) -> List[dict]:
-        """Load CSV and validate required columns."""
+    def _load_input(self) -> List[Tuple[tuple, tuple]]:
+        """Load CSV and validate required columns.
+
+        Returns (raw values, row) pairs: the raw values key deduplication,
+        the row is the fixed ROW_COLUMNS layout used by every later phase.
+        """
         rows = []
 
-        with open(self.input_path, 'r', newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        with open(self.input_path, 'r', newline='', encoding='utf-8',
+                  buffering=INPUT_BUFFER_SIZE) as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
 
             # Check required columns
-            if reader.fieldnames:
-                missing = REQUIRED_COLUMNS - set(reader.fieldnames)
+            if header:
+                missing = REQUIRED_COLUMNS - set(header)
                 if missing:
                     self.add_error(Error(
                         error_type='MISSING_COLUMNS',
@@ -287,301 +411,337 @@ class MergePipeline:
                     ))
                     return []
 
-            for row in reader:
+            to_row = self._row_builder(header or [])
+
+            for raw in reader:
+                if not raw:
+                    continue  # Blank line (DictReader skips these too)
+
                 self.summary['input_rows'] += 1
+                row = to_row(raw)
 
                 # Check for missing identity values
-                if not row.get('session_id') or row.get('session_id').strip() == '':
-                    self.add_error(Error(
-                        error_type='MISSING_IDENTITY',
-                        severity='FATAL',
-                        column_name='session_id',
-                        raw_row=str(row)
-                    ))
-                    return rows
-
-                if not row.get('bar') or row.get('bar').strip() == '':
-                    self.add_error(Error(
-                        error_type='MISSING_IDENTITY',
-                        severity='FATAL',
-                        column_name='bar',
-                        raw_row=str(row)
-                    ))
-                    return rows
+                for col, name in ((COL_SESSION_ID, 'session_id'), (COL_BAR, 'bar'), (COL_TS, 'ts')):
+                    value = row[col]
+                    if not value or value.strip() == '':
+                        self.add_error(Error(
+                            error_type='MISSING_IDENTITY',
+                            severity='FATAL',
+                            column_name=name,
+                            raw_row=_RawRow(header or [], raw)
+                        ))
+                        return rows
 
-                if not row.get('ts') or row.get('ts').strip() == '':
-                    self.add_error(Error(
-                        error_type='MISSING_IDENTITY',
-                        severity='FATAL',
-                        column_name='ts',
-                        raw_row=str(row)
-                    ))
-                    return rows
+                # Parse bar once; a bad value is left for validation to report, as before
+                try:
+                    bar_num = int(row[COL_BAR])
+                except ValueError:
+                    bar_num = None
 
-                rows.append(row)
+                rows.append((tuple(raw), row + (bar_num,)))
 
         return rows
 
-    def _deduplicate(self, rows: List[dict]) -> List[dict]:
+    @staticmethod
+    def _row_builder(header: List[str]):
+        """Return a function mapping a raw csv.reader list to the ROW_COLUMNS tuple.
+
+        Absent optional columns get their ABSENT_COLUMN_DEFAULTS value; cells
+        missing from a short row are None, matching DictReader's restval.
+        INTERNED_COLUMNS cells are interned in place on the raw list.
+        """
+        index = {name: i for i, name in enumerate(header)}  # last duplicate wins, as in DictReader
+        width = len(header)
+        tail = []
+        positions = []
+        for name in ROW_COLUMNS:
+            if name in index:
+                positions.append(index[name])
+            else:
+                positions.append(width + len(tail))
+                tail.append(ABSENT_COLUMN_DEFAULTS.get(name, ''))
+        getter = itemgetter(*positions)
+        pad = [None] * width
+        intern_at = [index[name] for name in INTERNED_COLUMNS if name in index]
+        intern = sys.intern
+
+        def to_row(raw: List[str]) -> tuple:
+            n = len(raw)
+            for i in intern_at:
+                if i < n:
+                    raw[i] = intern(raw[i])
+            if n != width:
+                raw = raw[:width] if n > width else raw + pad[n:]
+            return getter(raw + tail) if tail else getter(raw)
+
+        return to_row
+
+    def _deduplicate(self, rows: List[Tuple[tuple, tuple]]) -> List[tuple]:
         """Remove exact duplicate rows, keeping first occurrence."""
-        seen: Dict[str, int] = {}  # row_key -> count
+        seen: Dict[tuple, list] = {}  # raw values -> [count, first row]
         result = []
 
-        for row in rows:
-            # Create hashable key from all values
-            row_key = tuple(sorted(row.items()))
-
-            if row_key in seen:
-                seen[row_key] += 1
-            else:
-                seen[row_key] = 1
+        for row_key, row in rows:
+            entry = seen.get(row_key)
+            if entry is None:
+                seen[row_key] = [1, row]
                 result.append(row)
+            else:
+                entry[0] += 1
 
         # Log duplicates
-        for row_key, count in seen.items():
+        for count, row in seen.values():
             if count > 1:
-                row_dict = dict(row_key)
                 self.add_error(Error(
                     error_type='DUPLICATE_ROW',
                     severity='RECOVERABLE',
-                    session_id=row_dict.get('session_id'),
-                    bar=row_dict.get('bar'),
-                    event_type=row_dict.get('event_type'),
+                    session_id=row[COL_SESSION_ID],
+                    bar=row[COL_BAR],
+                    event_type=row[COL_EVENT_TYPE],
                     value_a=f'count={count}'
                 ))
                 self.summary['duplicate_rows_dropped'] += (count - 1)
 
         return result
 
-    def _validate_sort_order(self, rows: List[dict]) -> bool:
-        """Verify rows are sorted by (session_id, bar, event_type_rank)."""
+    def _validate_rows(self, rows: List[tuple]) -> int:
+        """Validate sort order and timestamps in one pass.
+
+        Returns 0 if valid, else the exit code. Errors keep the spec
+        precedence: sort order (3), then timestamps (2). Zone type
+        consistency is checked during the merge.
+        """
         prev_key = None
+        last_bar_ts: Dict[str, Tuple[int, str]] = {}  # session_id -> (bar, max ts at that bar)
+        ts_error: Optional[Error] = None
+        event_rank = EVENT_TYPE_RANK.get
+        check_timestamp = self._check_timestamp
 
         for row in rows:
-            session_id = row.get('session_id', '')
-            bar = int(row.get('bar', 0))
-            event_type = row.get('event_type', '')
-            rank = EVENT_TYPE_RANK.get(event_type, 99)
-
-            current_key = (session_id, bar, rank)
-
-            if prev_key is not None:
-                if current_key < prev_key:
-                    self.add_error(Error(
-                        error_type='UNSORTED_INPUT',
-                        severity='FATAL',
-                        session_id=session_id,
-                        bar=str(bar),
-                        event_type=event_type
-                    ))
-                    return False
-
+            session_id = row[COL_SESSION_ID]
+            bar = row[COL_BAR_NUM]
+            if bar is None:
+                bar = int(row[COL_BAR])  # Raises, aborting the run as INTERNAL_ERROR
+            event_type = row[COL_EVENT_TYPE]
+
+            # Sort order: (session_id, bar, event_type_rank)
+            current_key = (session_id, bar, event_rank(event_type, 99))
+            if prev_key is not None and current_key < prev_key:
+                self.add_error(Error(
+                    error_type='UNSORTED_INPUT',
+                    severity='FATAL',
+                    session_id=session_id,
+                    bar=str(bar),
+                    event_type=event_type
+                ))
+                return 3
             prev_key = current_key
 
-        return True
-
-    def _validate_timestamps(self, rows: List[dict]) -> bool:
-        """Check timestamp monotonicity within sessions."""
-        # Group by session and track max ts per bar
-        session_bars: Dict[str, List[Tuple[int, str]]] = defaultdict(list)
+            # Timestamps: sorted input means each session's bars arrive in order,
+            # so a running (bar, max ts) per session replaces the group-and-sort
+            if ts_error is None:
+                ts_error = check_timestamp(last_bar_ts, session_id, bar, row[COL_TS])
 
-        for row in rows:
-            session_id = row.get('session_id', '')
-            bar = int(row.get('bar', 0))
-            ts = row.get('ts', '')
-            session_bars[session_id].append((bar, ts))
-
-        for session_id, bar_ts_list in session_bars.items():
-            # Sort by bar to check monotonicity
-            bar_ts_list.sort(key=lambda x: x[0])
-
-            prev_bar = None
-            prev_ts = None
-
-            for bar, ts in bar_ts_list:
-                if prev_bar is not None and bar > prev_bar:
-                    # Different bar - check ts didn't go backwards
-                    if ts < prev_ts:
-                        self.add_error(Error(
-                            error_type='TIMESTAMP_INVERSION',
-                            severity='FATAL',
-                            session_id=session_id,
-                            value_a=f'bar{prev_bar}={prev_ts}',
-                            value_b=f'bar{bar}={ts}'
-                        ))
-                        return False
-
-                # Update prev with max ts at this bar
-                if prev_bar == bar:
-                    prev_ts = max(prev_ts, ts) if prev_ts else ts
-                else:
-                    prev_bar = bar
-                    prev_ts = ts
-
-        return True
-
-    def _validate_zone_consistency(self, rows: List[dict]) -> bool:
-        """Check zone_type consistency per (session_id, zone_id)."""
-        zone_types: Dict[Tuple[str, str], str] = {}
-
-        for row in rows:
-            if row.get('event_type') != 'ENGAGEMENT_FINAL':
-                continue
+        if ts_error is not None:
+            self.add_error(ts_error)
+            return 2
 
-            session_id = row.get('session_id', '')
-            zone_id = row.get('zone_id', '')
-            zone_type = row.get('zone_type', '')
+        return 0
+
+    def _check_timestamp(self, last_bar_ts: Dict[str, Tuple[int, str]],
+                         session_id: str, bar: int, ts: str) -> Optional[Error]:
+        """Check ts didn't go backwards from the previous bar; return the inversion, if any."""
+        prev = last_bar_ts.get(session_id)
+        if prev is None:
+            last_bar_ts[session_id] = (bar, ts)
+            return None
+
+        prev_bar, prev_ts = prev
+        if bar > prev_bar:
+            # Different bar - check ts didn't go backwards
+            if ts < prev_ts:
+                return Error(
+                    error_type='TIMESTAMP_INVERSION',
+                    severity='FATAL',
+                    session_id=session_id,
+                    value_a=f'bar{prev_bar}={prev_ts}',
+                    value_b=f'bar{bar}={ts}'
+                )
+            last_bar_ts[session_id] = (bar, ts)
+        elif bar == prev_bar:
+            # Track max ts at this bar
+            last_bar_ts[session_id] = (bar, max(prev_ts, ts) if prev_ts else ts)
+        # bar < prev_bar only happens in unsorted input, which the sort check rejects
+
+        return None
+
+    def _check_zone_type(self, row: tuple) -> bool:
+        """Check zone_type consistency per (session_id, zone_id); return True if fatal."""
+        zone_id = row[COL_ZONE_ID]
+        if not zone_id or zone_id == '-1':
+            return False
 
-            if not zone_id or zone_id == '-1':
-                continue
+        session_id = row[COL_SESSION_ID]
+        zone_type = row[COL_ZONE_TYPE]
+        key = (session_id, zone_id)
 
-            key = (session_id, zone_id)
+        known = self.zone_type_by_id.get(key)
+        if known is None:
+            self.zone_type_by_id[key] = zone_type
+            return False
 
-            if key in zone_types:
-                if zone_types[key] != zone_type:
-                    self.add_error(Error(
-                        error_type='ZONE_TYPE_INCONSISTENCY',
-                        severity='FATAL',
-                        session_id=session_id,
-                        column_name=f'zone_id={zone_id}',
-                        value_a=zone_types[key],
-                        value_b=zone_type
-                    ))
-                    return False
-            else:
-                zone_types[key] = zone_type
+        if known != zone_type:
+            return self.add_error(Error(
+                error_type='ZONE_TYPE_INCONSISTENCY',
+                severity='FATAL',
+                session_id=session_id,
+                column_name=f'zone_id={zone_id}',
+                value_a=known,
+                value_b=zone_type
+            ))
 
-        return True
+        return False
 
     # =========================================================================
     # PHASE 1: SINGLE-PASS MERGE
     # =========================================================================
 
-    def _merge(self, rows: List[dict]) -> None:
-        """Single-pass merge: build contexts, then engagements."""
-        # Track current context being built
-        current_context: Optional[ContextRow] = None
-        current_session_bar: Optional[Tuple[str, str]] = None
+    def _merge(self, rows: List[tuple]) -> None:
+        """Single-pass merge: build contexts, then engagements.
 
-        # Track context events per (session_id, bar) for duplicate detection
-        snapshot_seen: Set[Tuple[str, str]] = set()
-        lock_seen: Set[Tuple[str, str]] = set()
+        Rows are dispatched on event_type to the _handle_* methods, which
+        share the merge state held on self.
+        """
+        handlers = {
+            'PHASE_SNAPSHOT': self._handle_snapshot,
+            'MODE_LOCK': self._handle_lock,
+            'ENGAGEMENT_FINAL': self._handle_engagement,
+        }
+        session_bar_key = self._session_bar_key
 
         for row in rows:
-            session_id = row.get('session_id', '')
-            bar = row.get('bar', '')
-            event_type = row.get('event_type', '')
-
-            key = (session_id, bar)
-
-            # Handle context events
-            if event_type == 'PHASE_SNAPSHOT':
-                # Check for duplicate
-                if key in snapshot_seen:
-                    if self.add_error(Error(
-                        error_type='DUPLICATE_CONTEXT_SNAPSHOT',
-                        severity='FATAL',
-                        session_id=session_id,
-                        bar=bar,
-                        event_type=event_type
-                    )):
-                        return
-                snapshot_seen.add(key)
-
-                # Start or update context
-                if current_session_bar != key:
-                    self._finalize_context(current_context)
-                    current_context = self._create_context_from_snapshot(row)
-                    current_session_bar = key
-                else:
-                    self._merge_snapshot_into_context(current_context, row)
-
-            elif event_type == 'MODE_LOCK':
-                # Check for duplicate
-                if key in lock_seen:
-                    if self.add_error(Error(
-                        error_type='DUPLICATE_CONTEXT_LOCK',
-                        severity='FATAL',
-                        session_id=session_id,
-                        bar=bar,
-                        event_type=event_type
-                    )):
-                        return
-                lock_seen.add(key)
-
-                # Start or update context
-                if current_session_bar != key:
-                    self._finalize_context(current_context)
-                    current_context = self._create_context_from_lock(row)
-                    current_session_bar = key
-                else:
-                    self._merge_lock_into_context(current_context, row)
-
-            elif event_type == 'ENGAGEMENT_FINAL':
-                # Finalize any pending context first (for same-bar lookup)
-                if current_session_bar == key:
-                    self._finalize_context(current_context)
-                    current_context = None
-                    current_session_bar = None
-                elif current_context is not None:
-                    self._finalize_context(current_context)
-                    current_context = None
-                    current_session_bar = None
-
-                # Process engagement
-                self._process_engagement(row)
+            handler = handlers.get(row[COL_EVENT_TYPE])
+            if handler is None:
+                continue
+            key = session_bar_key(row[COL_SESSION_ID], row[COL_BAR_NUM])
+            if handler(row, key):
+                return  # Fatal error, abort
 
         # Finalize last context
-        self._finalize_context(current_context)
+        self._finalize_context(self._current_context)
+
+    def _handle_snapshot(self, row: tuple, key: int) -> bool:
+        """Handle PHASE_SNAPSHOT; return True if the merge must abort."""
+        # Check for duplicate
+        if key in self._snapshot_seen:
+            if self.add_error(Error(
+                error_type='DUPLICATE_CONTEXT_SNAPSHOT',
+                severity='FATAL',
+                session_id=row[COL_SESSION_ID],
+                bar=row[COL_BAR],
+                event_type=row[COL_EVENT_TYPE]
+            )):
+                return True
+        self._snapshot_seen.add(key)
+
+        # Start or update context
+        if self._current_session_bar != key:
+            self._finalize_context(self._current_context)
+            self._current_context = self._create_context_from_snapshot(row)
+            self._current_session_bar = key
+        else:
+            self._merge_snapshot_into_context(self._current_context, row)
+        return False
+
+    def _handle_lock(self, row: tuple, key: int) -> bool:
+        """Handle MODE_LOCK; return True if the merge must abort."""
+        # Check for duplicate
+        if key in self._lock_seen:
+            if self.add_error(Error(
+                error_type='DUPLICATE_CONTEXT_LOCK',
+                severity='FATAL',
+                session_id=row[COL_SESSION_ID],
+                bar=row[COL_BAR],
+                event_type=row[COL_EVENT_TYPE]
+            )):
+                return True
+        self._lock_seen.add(key)
+
+        # Start or update context
+        if self._current_session_bar != key:
+            self._finalize_context(self._current_context)
+            self._current_context = self._create_context_from_lock(row)
+            self._current_session_bar = key
+        else:
+            self._merge_lock_into_context(self._current_context, row)
+        return False
+
+    def _handle_engagement(self, row: tuple, key: int) -> bool:
+        """Handle ENGAGEMENT_FINAL; return True if the merge must abort."""
+        # Zone type must stay consistent per (session_id, zone_id)
+        if self._check_zone_type(row):
+            return True
+
+        # Finalize any pending context first (for same-bar lookup)
+        if self._current_context is not None:
+            self._finalize_context(self._current_context)
+            self._current_context = None
+            self._current_session_bar = None
 
-    def _create_context_from_snapshot(self, row: dict) -> ContextRow:
+        # Process engagement
+        self._process_engagement(row, key)
+        return False
+
+    def _create_context_from_snapshot(self, row: tuple) -> ContextRow:
         """Create new context from PHASE_SNAPSHOT."""
-        zone_id = row.get('zone_id', '')
+        zone_id = row[COL_ZONE_ID]
         if zone_id == '-1':
             zone_id = None
 
-        zone_type = row.get('zone_type', '')
+        zone_type = row[COL_ZONE_TYPE]
         if zone_type == 'NONE':
             zone_type = None
 
         return ContextRow(
-            session_id=row.get('session_id', ''),
-            bar=row.get('bar', ''),
-            session_type=row.get('session_type', ''),
-            ts=row.get('ts', ''),
-            phase=row.get('phase') or None,
+            session_id=row[COL_SESSION_ID],
+            bar=row[COL_BAR],
+            session_type=row[COL_SESSION_TYPE],
+            ts=row[COL_TS],
+            phase=row[COL_PHASE] or None,
             zone_id_snapshot=zone_id,
             zone_type_snapshot=zone_type,
-            snapshot_message=row.get('message') or None,
+            snapshot_message=row[COL_MESSAGE] or None,
             _source_rows=1,
-            _has_snapshot=True
+            _bar_num=row[COL_BAR_NUM],
+            _sources=SOURCE_SNAPSHOT
         )
 
-    def _create_context_from_lock(self, row: dict) -> ContextRow:
+    def _create_context_from_lock(self, row: tuple) -> ContextRow:
         """Create new context from MODE_LOCK."""
         # Extract raw_state from message (format: "raw:VALUE")
-        message = row.get('message', '')
+        message = row[COL_MESSAGE]
         raw_state = None
         if message.startswith('raw:'):
             raw_state = message[4:]
 
         return ContextRow(
-            session_id=row.get('session_id', ''),
-            bar=row.get('bar', ''),
-            session_type=row.get('session_type', ''),
-            ts=row.get('ts', ''),
-            aggression=row.get('aggression') or None,
-            facilitation=row.get('facilitation') or None,
-            market_state=row.get('market_state') or None,
+            session_id=row[COL_SESSION_ID],
+            bar=row[COL_BAR],
+            session_type=row[COL_SESSION_TYPE],
+            ts=row[COL_TS],
+            aggression=row[COL_AGGRESSION] or None,
+            facilitation=row[COL_FACILITATION] or None,
+            market_state=row[COL_MARKET_STATE] or None,
             raw_state=raw_state,
             _source_rows=1,
-            _has_lock=True
+            _bar_num=row[COL_BAR_NUM],
+            _sources=SOURCE_LOCK
         )
 
-    def _merge_snapshot_into_context(self, ctx: ContextRow, row: dict) -> None:
+    def _merge_snapshot_into_context(self, ctx: ContextRow, row: tuple) -> None:
         """Merge PHASE_SNAPSHOT into existing context."""
         # Check identity match
-        if ctx.session_type != row.get('session_type', ''):
+        if ctx.session_type != row[COL_SESSION_TYPE]:
             self.add_error(Error(
                 error_type='IDENTITY_CONFLICT',
                 severity='FATAL',
@@ -589,29 +749,29 @@ class MergePipeline:
                 bar=ctx.bar,
                 column_name='session_type',
                 value_a=ctx.session_type,
-                value_b=row.get('session_type', '')
+                value_b=row[COL_SESSION_TYPE]
             ))
             return
 
-        zone_id = row.get('zone_id', '')
+        zone_id = row[COL_ZONE_ID]
         if zone_id == '-1':
             zone_id = None
 
-        zone_type = row.get('zone_type', '')
+        zone_type = row[COL_ZONE_TYPE]
         if zone_type == 'NONE':
             zone_type = None
 
-        ctx.phase = row.get('phase') or ctx.phase
+        ctx.phase = row[COL_PHASE] or ctx.phase
         ctx.zone_id_snapshot = zone_id or ctx.zone_id_snapshot
         ctx.zone_type_snapshot = zone_type or ctx.zone_type_snapshot
-        ctx.snapshot_message = row.get('message') or ctx.snapshot_message
+        ctx.snapshot_message = row[COL_MESSAGE] or ctx.snapshot_message
         ctx._source_rows += 1
-        ctx._has_snapshot = True
+        ctx._sources |= SOURCE_SNAPSHOT
 
-    def _merge_lock_into_context(self, ctx: ContextRow, row: dict) -> None:
+    def _merge_lock_into_context(self, ctx: ContextRow, row: tuple) -> None:
         """Merge MODE_LOCK into existing context."""
         # Check identity match
-        if ctx.session_type != row.get('session_type', ''):
+        if ctx.session_type != row[COL_SESSION_TYPE]:
             self.add_error(Error(
                 error_type='IDENTITY_CONFLICT',
                 severity='FATAL',
@@ -619,41 +779,56 @@ class MergePipeline:
                 bar=ctx.bar,
                 column_name='session_type',
                 value_a=ctx.session_type,
-                value_b=row.get('session_type', '')
+                value_b=row[COL_SESSION_TYPE]
             ))
             return
 
         # Extract raw_state from message
-        message = row.get('message', '')
+        message = row[COL_MESSAGE]
         raw_state = None
         if message.startswith('raw:'):
             raw_state = message[4:]
 
-        ctx.aggression = row.get('aggression') or ctx.aggression
-        ctx.facilitation = row.get('facilitation') or ctx.facilitation
-        ctx.market_state = row.get('market_state') or ctx.market_state
+        ctx.aggression = row[COL_AGGRESSION] or ctx.aggression
+        ctx.facilitation = row[COL_FACILITATION] or ctx.facilitation
+        ctx.market_state = row[COL_MARKET_STATE] or ctx.market_state
         ctx.raw_state = raw_state or ctx.raw_state
         ctx._source_rows += 1
-        ctx._has_lock = True
+        ctx._sources |= SOURCE_LOCK
 
     def _finalize_context(self, ctx: Optional[ContextRow]) -> None:
         """Finalize and store context row."""
         if ctx is None:
             return
 
-        ctx.context_complete = ctx._has_snapshot and ctx._has_lock
+        ctx.context_complete = ctx._sources == SOURCE_COMPLETE
         self.contexts.append(ctx)
-        self.context_by_session_bar[(ctx.session_id, ctx.bar)] = ctx
         self.summary['context_rows'] += 1
 
-    def _process_engagement(self, row: dict) -> None:
-        """Process ENGAGEMENT_FINAL row."""
-        session_id = row.get('session_id', '')
-        bar = row.get('bar', '')
-        zone_id = row.get('zone_id', '')
+        bar = ctx._bar_num
+        by_bar = self._ctx_by_session.setdefault(ctx.session_id, {})
+        if bar not in by_bar:
+            insort(self._ctx_bars_by_session.setdefault(ctx.session_id, []), bar)
+        by_bar[bar] = ctx
+
+    def _session_bar_key(self, session_id: str, bar: int) -> int:
+        """Pack (session_id, bar) into one int: (bar << 32) | dense session index.
+
+        Injective for any int bar while there are fewer than 2**32 sessions.
+        """
+        idx = self._session_index.get(session_id)
+        if idx is None:
+            idx = self._session_index[session_id] = len(self._session_index)
+        return (bar << 32) | idx
+
+    def _process_engagement(self, row: tuple, key: int) -> None:
+        """Process ENGAGEMENT_FINAL row (key: its packed session/bar key)."""
+        session_id = row[COL_SESSION_ID]
+        bar = row[COL_BAR]
+        zone_id = row[COL_ZONE_ID]
 
         # Check for duplicate engagement
-        eng_key = (session_id, bar, zone_id)
+        eng_key = (key, zone_id)
         if eng_key in self.seen_engagements:
             self.add_error(Error(
                 error_type='DUPLICATE_ENGAGEMENT',
@@ -666,37 +841,31 @@ class MergePipeline:
         self.seen_engagements.add(eng_key)
 
         # Validate prices
-        entry_price = row.get('entry_price', '0')
-        exit_price = row.get('exit_price', '0')
+        entry_price = row[COL_ENTRY_PRICE]
+        exit_price = row[COL_EXIT_PRICE]
 
-        try:
-            if float(entry_price) == 0:
-                self.add_error(Error(
-                    error_type='INVALID_ENGAGEMENT_PRICE',
-                    severity='RECOVERABLE',
-                    session_id=session_id,
-                    bar=bar,
-                    column_name='entry_price'
-                ))
-                return
-        except ValueError:
-            pass
+        if _is_zero_price(entry_price):
+            self.add_error(Error(
+                error_type='INVALID_ENGAGEMENT_PRICE',
+                severity='RECOVERABLE',
+                session_id=session_id,
+                bar=bar,
+                column_name='entry_price'
+            ))
+            return
 
-        try:
-            if float(exit_price) == 0:
-                self.add_error(Error(
-                    error_type='INVALID_ENGAGEMENT_PRICE',
-                    severity='RECOVERABLE',
-                    session_id=session_id,
-                    bar=bar,
-                    column_name='exit_price'
-                ))
-                return
-        except ValueError:
-            pass
+        if _is_zero_price(exit_price):
+            self.add_error(Error(
+                error_type='INVALID_ENGAGEMENT_PRICE',
+                severity='RECOVERABLE',
+                session_id=session_id,
+                bar=bar,
+                column_name='exit_price'
+            ))
+            return
 
         # Validate outcome
-        outcome = row.get('outcome', '')
+        outcome = row[COL_OUTCOME]
         if outcome not in VALID_OUTCOMES:
             self.add_error(Error(
                 error_type='INVALID_OUTCOME',
@@ -709,22 +878,23 @@ class MergePipeline:
             return
 
         # Context lookup: MAX(bar) WHERE bar <= engagement.bar AND same session
-        context = self._lookup_context(session_id, int(bar))
+        bar_num = row[COL_BAR_NUM]
+        context = self._lookup_context(session_id, bar_num)
 
         # Build engagement row
         eng = EngagementRow(
             session_id=session_id,
             bar=bar,
-            ts=row.get('ts', ''),
-            session_type=row.get('session_type', ''),
+            ts=row[COL_TS],
+            session_type=row[COL_SESSION_TYPE],
             zone_id=zone_id,
-            zone_type=row.get('zone_type', ''),
+            zone_type=row[COL_ZONE_TYPE],
             entry_price=entry_price,
             exit_price=exit_price,
-            bars=row.get('bars', ''),
+            bars=row[COL_BARS],
             outcome=outcome,
-            escape_vel=row.get('escape_vel', ''),
-            vol_ratio=row.get('vol_ratio', '')
+            escape_vel=row[COL_ESCAPE_VEL],
+            vol_ratio=row[COL_VOL_RATIO]
         )
 
         if context is None:
@@ -738,7 +908,7 @@ class MergePipeline:
             eng.ctx_phase = context.phase
 
             # Check staleness
-            bar_delta = int(bar) - int(context.bar)
+            bar_delta = bar_num - context._bar_num
             eng.context_stale = bar_delta > STALENESS_THRESHOLD
 
             if eng.context_stale:
@@ -753,18 +923,14 @@ class MergePipeline:
 
     def _lookup_context(self, session_id: str, bar: int) -> Optional[ContextRow]:
         """Find most recent context for session at or before bar."""
-        best_context = None
-        best_bar = -1
-
-        for (sid, ctx_bar), ctx in self.context_by_session_bar.items():
-            if sid != session_id:
-                continue
-            ctx_bar_int = int(ctx_bar)
-            if ctx_bar_int <= bar and ctx_bar_int > best_bar:
-                best_bar = ctx_bar_int
-                best_context = ctx
+        bars = self._ctx_bars_by_session.get(session_id)
+        if not bars:
+            return None
 
-        return best_context
+        i = bisect_right(bars, bar)
+        if i == 0 or bars[i - 1] < 0:
+            return None
+        return self._ctx_by_session[session_id][bars[i - 1]]
 
     # =========================================================================
     # OUTPUT
@@ -772,6 +938,8 @@ class MergePipeline:
 
     def _write_outputs(self) -> None:
         """Write all output files."""
+        if not self.write_outputs:
+            return
         self._write_context_csv()
         self._write_engagement_csv()
         self._write_error_csv()
@@ -781,50 +949,28 @@ class MergePipeline:
         """Write context.csv."""
         path = self.output_dir / 'context.csv'
 
-        fieldnames = [
-            'session_id', 'bar', 'session_type', 'ts', 'phase',
-            'zone_id_snapshot', 'zone_type_snapshot', 'aggression',
-            'facilitation', 'market_state', 'raw_state', 'snapshot_message',
-            'context_complete', '_source_rows'
-        ]
-
-        with open(path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for ctx in self.contexts:
-                writer.writerow(ctx.to_dict())
+        with open(path, 'w', newline='', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(CONTEXT_FIELDS)
+            writer.writerows(ctx.as_tuple() for ctx in self.contexts)
 
     def _write_engagement_csv(self) -> None:
         """Write engagement.csv."""
         path = self.output_dir / 'engagement.csv'
 
-        fieldnames = [
-            'session_id', 'bar', 'ts', 'session_type', 'zone_id', 'zone_type',
-            'entry_price', 'exit_price', 'bars', 'outcome', 'escape_vel', 'vol_ratio',
-            'context_bar', 'context_stale', 'ctx_aggression', 'ctx_facilitation',
-            'ctx_market_state', 'ctx_phase', 'orphan', '_flags'
-        ]
-
-        with open(path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for eng in self.engagements:
-                writer.writerow(eng.to_dict())
+        with open(path, 'w', newline='', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(ENGAGEMENT_FIELDS)
+            writer.writerows(eng.as_tuple() for eng in self.engagements)
 
     def _write_error_csv(self) -> None:
         """Write error.csv."""
         path = self.output_dir / 'error.csv'
 
-        fieldnames = [
-            'error_type', 'severity', 'session_id', 'bar', 'event_type',
-            'column_name', 'value_a', 'value_b', 'raw_row', 'ts_detected'
-        ]
-
-        with open(path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for err in self.errors:
-                writer.writerow(err.to_dict())
+        with open(path, 'w', newline='', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(ERROR_FIELDS)
+            writer.writerows(err.as_tuple() for err in self.errors)
 
     def _write_summary_json(self) -> None:
         """Write summary.json."""
@@ -833,8 +979,9 @@ class MergePipeline:
         self.summary['exit_code'] = 2 if self.has_fatal else (1 if self.has_recoverable else 0)
         self.summary['ts_completed'] = datetime.now().isoformat()
 
+        # Serialize in one call: json.dump issues a write() per token
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(self.summary, f, indent=2)
+            f.write(json.dumps(self.summary, indent=2))
 
 
 # =============================================================================
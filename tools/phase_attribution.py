@@ -8,11 +8,55 @@ and why FAILED_AUCTION is elevated.
 
 import re
 import sys
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, deque, namedtuple
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
-
-@dataclass
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+# Log line patterns, compiled once at import
+_BAR_RE = re.compile(r'Bar\s+(\d+)')
+
+_PRIM_PATTERNS = (
+    (re.compile(r'P=([0-9.]+)'), 'price', float),
+    (re.compile(r'POC=([0-9.]+)'), 'poc', float),
+    (re.compile(r'VAH=([0-9.]+)'), 'vah', float),
+    (re.compile(r'VAL=([0-9.]+)'), 'val', float),
+    (re.compile(r'inVA=(\d)'), 'inVA', lambda x: x == '1'),
+    (re.compile(r'atVAL=(\d)'), 'atVAL', lambda x: x == '1'),
+    (re.compile(r'atVAH=(\d)'), 'atVAH', lambda x: x == '1'),
+    (re.compile(r'dPOC=([0-9.]+)'), 'dPOC', float),
+    (re.compile(r'vaRange=([0-9.]+)'), 'vaRange', float),
+    (re.compile(r'outStreak=(\d+)'), 'outStreak', int),
+    (re.compile(r'accepted=(\d)'), 'accepted', int),
+)
+
+# Whole-line forms of the Prim: and REGIME: lines as the study logs them.
+# When one matches and nothing before it could satisfy a field pattern, its
+# groups are exactly what the per-field searches would find, so the parsers
+# take one search instead of a dozen and fall back to the field patterns
+# otherwise.
+_PRIM_LINE_RE = re.compile(
+    r'Prim: P=([0-9.]+) POC=([0-9.]+) VAH=([0-9.]+) VAL=([0-9.]+) '
+    r'\| inVA=(\d) atVAL=(\d) atVAH=(\d) \| dPOC=([0-9.]+) vaRange=([0-9.]+) '
+    r'\| outStreak=(\d+) accepted=(\d)')
+_REGIME_LINE_RE = re.compile(
+    r'REGIME: RAW=(\w+) CONF=(\w+) \| PHASE: RAW=(\w+) CONF=(\w+) \| streak=(\d+)/(\d+)')
+
+_REGIME_PHASE_PATTERNS = (
+    (re.compile(r'REGIME:.*?RAW=(\w+)'), 'raw_regime'),
+    (re.compile(r'REGIME:.*?CONF=(\w+)'), 'conf_regime'),
+    (re.compile(r'PHASE:.*?RAW=(\w+)'), 'raw_phase'),
+    (re.compile(r'PHASE:.*?CONF=(\w+)'), 'conf_phase'),
+)
+_STREAK_RE = re.compile(r'streak=(\d+)/(\d+)')
+
+_PHASE_REASON_RE = re.compile(r'Ph=(\w+)')
+_REGIME_REASON_RE = re.compile(r'Rg=(\w+)')
+
+# slots=True (3.10+) drops the per-instance __dict__; older interpreters get a plain dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class BarState:
     """Parsed state for a single bar."""
     bar_num: int = 0
@@ -42,66 +86,84 @@ class BarState:
 
 def parse_bar_number(line: str) -> Optional[int]:
     """Extract bar number from log line."""
-    match = re.search(r'Bar\s+(\d+)', line)
+    match = _BAR_RE.search(line)
     return int(match.group(1)) if match else None
 
 
 def parse_primitives(line: str) -> Dict:
     """Parse: Prim: P=6969.00 POC=6975.00 VAH=6979.50 VAL=6971.75 | inVA=0 atVAL=0 atVAH=0 | dPOC=24.0 vaRange=31.0 | outStreak=13 accepted=1"""
+    match = _PRIM_LINE_RE.search(line)
+    if match and '=' not in line[:match.start()]:
+        price, poc, vah, val, inVA, atVAL, atVAH, dPOC, vaRange, outStreak, accepted = match.groups()
+        return {
+            'price': float(price), 'poc': float(poc), 'vah': float(vah), 'val': float(val),
+            'inVA': inVA == '1', 'atVAL': atVAL == '1', 'atVAH': atVAH == '1',
+            'dPOC': float(dPOC), 'vaRange': float(vaRange),
+            'outStreak': int(outStreak), 'accepted': int(accepted),
+        }
+
     result = {}
-    patterns = [
-        (r'P=([0-9.]+)', 'price', float),
-        (r'POC=([0-9.]+)', 'poc', float),
-        (r'VAH=([0-9.]+)', 'vah', float),
-        (r'VAL=([0-9.]+)', 'val', float),
-        (r'inVA=(\d)', 'inVA', lambda x: x == '1'),
-        (r'atVAL=(\d)', 'atVAL', lambda x: x == '1'),
-        (r'atVAH=(\d)', 'atVAH', lambda x: x == '1'),
-        (r'dPOC=([0-9.]+)', 'dPOC', float),
-        (r'vaRange=([0-9.]+)', 'vaRange', float),
-        (r'outStreak=(\d+)', 'outStreak', int),
-        (r'accepted=(\d)', 'accepted', int),
-    ]
-    for pattern, key, converter in patterns:
-        match = re.search(pattern, line)
+    for pattern, key, converter in _PRIM_PATTERNS:
+        match = pattern.search(line)
         if match:
             result[key] = converter(match.group(1))
     return result
 
 
 def parse_regime_phase(line: str) -> Dict:
-    """Parse: REGIME: RAW=X CONF=Y | PHASE: RAW=A CONF=B | streak=N/M"""
+    """Parse: REGIME: RAW=X CONF=Y | PHASE: RAW=A CONF=B | streak=N/M
+
+    Regime/phase names are interned: the vocabulary is small and every bar
+    holds four of them, which later key the report Counters.
+    """
+    intern = sys.intern
+    match = _REGIME_LINE_RE.search(line)
+    if match:
+        prefix = line[:match.start()]
+        if 'REGIME:' not in prefix and 'PHASE:' not in prefix and 'streak=' not in prefix:
+            raw_regime, conf_regime, raw_phase, conf_phase, streak, min_confirm = match.groups()
+            return {
+                'raw_regime': intern(raw_regime), 'conf_regime': intern(conf_regime),
+                'raw_phase': intern(raw_phase), 'conf_phase': intern(conf_phase),
+                'streak': int(streak), 'min_confirm': int(min_confirm),
+            }
+
     result = {}
-    patterns = [
-        (r'REGIME:.*?RAW=(\w+)', 'raw_regime'),
-        (r'REGIME:.*?CONF=(\w+)', 'conf_regime'),
-        (r'PHASE:.*?RAW=(\w+)', 'raw_phase'),
-        (r'PHASE:.*?CONF=(\w+)', 'conf_phase'),
-        (r'streak=(\d+)/(\d+)', 'streak'),
-    ]
-    for pattern, key in patterns:
-        match = re.search(pattern, line)
+    for pattern, key in _REGIME_PHASE_PATTERNS:
+        match = pattern.search(line)
         if match:
-            if key == 'streak':
-                result['streak'] = int(match.group(1))
-                result['min_confirm'] = int(match.group(2))
-            else:
-                result[key] = match.group(1)
+            result[key] = intern(match.group(1))
+    match = _STREAK_RE.search(line)
+    if match:
+        result['streak'] = int(match.group(1))
+        result['min_confirm'] = int(match.group(2))
     return result
 
 
 def parse_reasons(line: str) -> Dict:
-    """Parse: Reasons: Ph=PULLBACK_TO_VALUE Rg=ACCEPTED_BELOW_VA"""
+    """Parse: Reasons: Ph=PULLBACK_TO_VALUE Rg=ACCEPTED_BELOW_VA (names interned)"""
     result = {}
-    match = re.search(r'Ph=(\w+)', line)
+    match = _PHASE_REASON_RE.search(line)
     if match:
-        result['phase_reason'] = match.group(1)
-    match = re.search(r'Rg=(\w+)', line)
+        result['phase_reason'] = sys.intern(match.group(1))
+    match = _REGIME_REASON_RE.search(line)
     if match:
-        result['regime_reason'] = match.group(1)
+        result['regime_reason'] = sys.intern(match.group(1))
     return result
 
 
+# Reason vocabularies that imply a location (see infer_location_from_reasons)
+_AT_VAL_PHASE_REASONS = ('AT_VAL', 'TESTING_VAL')
+_AT_VAH_PHASE_REASONS = ('AT_VAH', 'TESTING_VAH')
+_INSIDE_PHASE_REASONS = ('INSIDE_VALUE', 'INSIDE_VALUE_DEFAULT')
+_OUTSIDE_PHASE_REASONS = ('OUTSIDE_ABOVE_VA', 'OUTSIDE_BELOW_VA', 'FAR_FROM_POC',
+                          'FAR_FROM_POC_CONTINUING', 'RANGE_EXT_HIGH', 'RANGE_EXT_LOW',
+                          'PULLBACK_TO_VALUE')
+_OUTSIDE_REGIME_REASONS = ('PROBE_ABOVE_VA', 'PROBE_BELOW_VA',
+                           'ACCEPTED_ABOVE_VA', 'ACCEPTED_BELOW_VA')
+_INSIDE_REGIME_REASONS = ('INSIDE_VALUE', 'TESTING_VAH', 'TESTING_VAL')
+
+
 def infer_location_from_reasons(phase_reason: str, regime_reason: str) -> Tuple[Optional[bool], bool, bool]:
     """
     Infer (inVA, atVAL, atVAH) from phase/regime reason strings.
@@ -112,121 +174,202 @@ def infer_location_from_reasons(phase_reason: str, regime_reason: str) -> Tuple[
     atVAH = False
 
     # Phase reasons that indicate location
-    if phase_reason in ('AT_VAL', 'TESTING_VAL'):
+    if phase_reason in _AT_VAL_PHASE_REASONS:
         atVAL = True
         inVA = True  # At boundary is considered "in VA" for logging
-    elif phase_reason in ('AT_VAH', 'TESTING_VAH'):
+    elif phase_reason in _AT_VAH_PHASE_REASONS:
         atVAH = True
         inVA = True
-    elif phase_reason in ('INSIDE_VALUE', 'INSIDE_VALUE_DEFAULT'):
+    elif phase_reason in _INSIDE_PHASE_REASONS:
         inVA = True
-    elif phase_reason in ('OUTSIDE_ABOVE_VA', 'OUTSIDE_BELOW_VA', 'FAR_FROM_POC',
-                          'FAR_FROM_POC_CONTINUING', 'RANGE_EXT_HIGH', 'RANGE_EXT_LOW',
-                          'PULLBACK_TO_VALUE'):
+    elif phase_reason in _OUTSIDE_PHASE_REASONS:
         inVA = False
 
     # Regime reasons can also indicate location
-    if regime_reason in ('PROBE_ABOVE_VA', 'PROBE_BELOW_VA',
-                         'ACCEPTED_ABOVE_VA', 'ACCEPTED_BELOW_VA'):
+    if regime_reason in _OUTSIDE_REGIME_REASONS:
         inVA = False
-    elif regime_reason in ('INSIDE_VALUE', 'TESTING_VAH', 'TESTING_VAL'):
+    elif regime_reason in _INSIDE_REGIME_REASONS:
         inVA = True
 
     return inVA, atVAL, atVAH
 
 
-def analyze_logs(filepath: str) -> Tuple[List[BarState], Dict]:
-    """Parse log file and extract bar states."""
-    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-        lines = f.readlines()
+# infer_location_from_reasons evaluated once for every known (phase, regime)
+# reason pair, '' standing for a missing reason; other pairs call it directly
+_LOCATION_BY_REASONS = {
+    (phase_reason, regime_reason): infer_location_from_reasons(phase_reason, regime_reason)
+    for phase_reason in ('',) + _AT_VAL_PHASE_REASONS + _AT_VAH_PHASE_REASONS
+    + _INSIDE_PHASE_REASONS + _OUTSIDE_PHASE_REASONS
+    for regime_reason in ('',) + _OUTSIDE_REGIME_REASONS + _INSIDE_REGIME_REASONS
+}
 
-    # Filter to AMT lines
-    amt_lines = [l for l in lines if '[AMT]' in l]
 
-    # Build bar states
-    bar_states = []
-    current_bar = BarState()
+class ExampleCollector:
+    """Collect log excerpts around lines containing a marker, fed one line at a time.
 
-    for line in amt_lines:
-        bar_num = parse_bar_number(line)
-        if bar_num and bar_num != current_bar.bar_num:
-            if current_bar.bar_num > 0:
-                bar_states.append(current_bar)
-            current_bar = BarState(bar_num=bar_num)
-
-        if 'Prim:' in line:
-            prims = parse_primitives(line)
-            for k, v in prims.items():
-                setattr(current_bar, k, v)
-
-        if 'REGIME:' in line and 'CONF=' in line:
-            rp = parse_regime_phase(line)
-            for k, v in rp.items():
-                setattr(current_bar, k, v)
-
-        if 'Reasons:' in line:
-            reasons = parse_reasons(line)
-            for k, v in reasons.items():
-                setattr(current_bar, k, v)
-            # Infer location from reasons if not already set from primitives
-            if current_bar.inVA is None:
-                inVA, atVAL, atVAH = infer_location_from_reasons(
-                    current_bar.phase_reason, current_bar.regime_reason)
-                if inVA is not None:
-                    current_bar.inVA = inVA
-                if atVAL:
-                    current_bar.atVAL = atVAL
-                if atVAH:
-                    current_bar.atVAH = atVAH
-
-    # Add last bar
+    Each excerpt is the marker line with up to 2 lines either side; lines
+    inside an excerpt are not searched for the next marker.
+    """
+
+    def __init__(self, marker: str, count: int = 5):
+        self.marker = marker
+        self.count = count
+        self.examples: List[str] = []
+        self._before = deque(maxlen=2)
+        self._excerpt: Optional[List[str]] = None
+        self._after = 0
+
+    @property
+    def full(self) -> bool:
+        """True once count excerpts are complete; later lines can't change the result."""
+        return len(self.examples) >= self.count and self._excerpt is None
+
+    def feed(self, line: str) -> bool:
+        """Consume one line; return True if this line completed the last excerpt."""
+        filled = False
+        if self._excerpt is not None:
+            self._excerpt.append(line)
+            self._after -= 1
+            if self._after == 0:
+                self._close()
+                filled = len(self.examples) >= self.count
+        elif len(self.examples) < self.count and self.marker in line:
+            self._excerpt = list(self._before)
+            self._excerpt.append(line)
+            self._after = 2
+        self._before.append(line)
+        return filled
+
+    def finish(self) -> List[str]:
+        """Close any excerpt cut short by end of file and return the examples."""
+        if self._excerpt is not None:
+            self._close()
+        return self.examples
+
+    def _close(self) -> None:
+        self.examples.append(''.join(self._excerpt).strip())
+        self._excerpt = None
+
+
+def iter_bars(filepath: str,
+              collectors: Tuple[ExampleCollector, ...] = ()) -> Iterator[BarState]:
+    """Parse log file and yield bar states in log order.
+
+    The file is read in one streaming pass; every line is also fed to the
+    given example collectors until they are full.  A bar is yielded as soon
+    as the next bar starts, so only the current one is held in memory.
+    """
+    current_bar = BarState()
+    collectors = tuple(c for c in collectors if not c.full)
+
+    with open(filepath, 'r', encoding='utf-8', errors='ignore', buffering=1 << 20) as f:
+        for line in f:
+            if collectors:
+                filled = False
+                for collector in collectors:
+                    filled |= collector.feed(line)
+                if filled:
+                    collectors = tuple(c for c in collectors if not c.full)
+            if '[AMT]' not in line:
+                continue
+
+            bar_num = parse_bar_number(line)
+            if bar_num and bar_num != current_bar.bar_num:
+                if current_bar.bar_num > 0:
+                    yield current_bar
+                current_bar = BarState(bar_num=bar_num)
+
+            if 'Prim:' in line:
+                prims = parse_primitives(line)
+                for k, v in prims.items():
+                    setattr(current_bar, k, v)
+
+            if 'REGIME:' in line and 'CONF=' in line:
+                rp = parse_regime_phase(line)
+                for k, v in rp.items():
+                    setattr(current_bar, k, v)
+
+            if 'Reasons:' in line:
+                reasons = parse_reasons(line)
+                for k, v in reasons.items():
+                    setattr(current_bar, k, v)
+                # Infer location from reasons if not already set from primitives
+                if current_bar.inVA is None:
+                    reason_key = (current_bar.phase_reason, current_bar.regime_reason)
+                    location = _LOCATION_BY_REASONS.get(reason_key)
+                    if location is None:
+                        location = infer_location_from_reasons(*reason_key)
+                    inVA, atVAL, atVAH = location
+                    if inVA is not None:
+                        current_bar.inVA = inVA
+                    if atVAL:
+                        current_bar.atVAL = atVAL
+                    if atVAH:
+                        current_bar.atVAH = atVAH
+
+    # Last bar
     if current_bar.bar_num > 0:
-        bar_states.append(current_bar)
+        yield current_bar
 
-    return bar_states, {}
 
+def analyze_logs(filepath: str,
+                 collectors: Tuple[ExampleCollector, ...] = ()) -> Tuple[List[BarState], Dict]:
+    """Parse log file and extract bar states."""
+    return list(iter_bars(filepath, collectors)), {}
+
+
+class PullbackAccumulator:
+    """PULLBACK predicate breakdown, built one bar at a time (bars in log order)."""
+
+    def __init__(self, afterglow_bars: int = 5):  # Default directionalAfterglowBars
+        self.stats = {
+            'total_bars': 0,
+            'outsideVA': 0,
+            'approachingPOC': 0,  # dPOC decreasing toward POC
+            'wasDirectionalRecently': 0,  # outStreak > 0 indicates prior movement
+            'all_three': 0,
+            'raw_pullback': 0,
+            'conf_pullback': 0,
+            # Suppression analysis for bars where all_three
+            'suppressed_by_testingBoundary': 0,
+            'suppressed_by_extension': 0,
+            'suppressed_by_trending': 0,  # conf_phase DRIVING_UP/DRIVING_DOWN
+            'suppressed_by_other': 0,
+            'eligible_for_pullback': 0,
+            # Streak analysis
+            'pullback_streak_distribution': Counter(),
+            'pullback_interrupted_by': Counter(),
+        }
+        self.prev_dPOC = None
+        self.prev_phase = None
+        self.afterglow_bars = afterglow_bars
+        self.directional_window = deque(maxlen=afterglow_bars)  # outsideVA (0/1) for the last N bars
+        self.outside_in_window = 0  # Running sum of directional_window
+
+    def update(self, bar: BarState) -> None:
+        stats = self.stats
+        stats['total_bars'] += 1
 
-def compute_pullback_predicates(bars: List[BarState]) -> Dict:
-    """Compute PULLBACK predicate breakdown."""
-    stats = {
-        'total_bars': len(bars),
-        'outsideVA': 0,
-        'approachingPOC': 0,  # dPOC decreasing toward POC
-        'wasDirectionalRecently': 0,  # outStreak > 0 indicates prior movement
-        'all_three': 0,
-        'raw_pullback': 0,
-        'conf_pullback': 0,
-        # Suppression analysis for bars where all_three
-        'suppressed_by_testingBoundary': 0,
-        'suppressed_by_extension': 0,
-        'suppressed_by_trending': 0,
-        'suppressed_by_other': 0,
-        'eligible_for_pullback': 0,
-        # Streak analysis
-        'pullback_streak_distribution': Counter(),
-        'pullback_interrupted_by': Counter(),
-    }
-
-    prev_dPOC = None
-    prev_phase = None
-    directional_window = []  # Track last N bars for afterglow
-    afterglow_bars = 5  # Default directionalAfterglowBars
-
-    for i, bar in enumerate(bars):
         # outsideVA: only true if we definitively know bar is outside (inVA=False)
         outsideVA = (bar.inVA is False)
 
         # approachingPOC: dPOC is decreasing (moving toward POC)
         approachingPOC = False
-        if prev_dPOC is not None and bar.dPOC < prev_dPOC:
+        if self.prev_dPOC is not None and bar.dPOC < self.prev_dPOC:
             approachingPOC = True
 
         # wasDirectionalRecently: had directional movement in last N bars
         # Using outStreak as proxy - if recently outside VA with movement
-        directional_window.append(outsideVA)
-        if len(directional_window) > afterglow_bars:
-            directional_window.pop(0)
-        wasDirectionalRecently = any(directional_window[:-1]) if len(directional_window) > 1 else False
+        # (the window includes the current bar, which doesn't count)
+        window = self.directional_window
+        if self.afterglow_bars > 0:
+            if len(window) == self.afterglow_bars:
+                self.outside_in_window -= window[0]
+            window.append(outsideVA)
+            self.outside_in_window += outsideVA
+            wasDirectionalRecently = self.outside_in_window - outsideVA > 0
+        else:
+            wasDirectionalRecently = False  # A zero-bar window never holds a prior bar
 
         if outsideVA:
             stats['outsideVA'] += 1
@@ -245,7 +388,7 @@ def compute_pullback_predicates(bars: List[BarState]) -> Dict:
             elif bar.conf_phase == 'RANGE_EXTENSION':
                 stats['suppressed_by_extension'] += 1
             elif bar.conf_phase in ('DRIVING_UP', 'DRIVING_DOWN'):
-                stats['suppressed_by_driving'] += 1
+                stats['suppressed_by_trending'] += 1
             elif bar.conf_phase == 'PULLBACK':
                 stats['eligible_for_pullback'] += 1
             else:
@@ -255,35 +398,55 @@ def compute_pullback_predicates(bars: List[BarState]) -> Dict:
             stats['raw_pullback'] += 1
             stats['pullback_streak_distribution'][bar.streak] += 1
             # Track what interrupted pullback
-            if prev_phase and prev_phase != 'PULLBACK' and bar.streak == 1:
+            if self.prev_phase and self.prev_phase != 'PULLBACK' and bar.streak == 1:
                 stats['pullback_interrupted_by'][bar.conf_phase] += 1
 
         if bar.conf_phase == 'PULLBACK':
             stats['conf_pullback'] += 1
 
-        prev_dPOC = bar.dPOC
-        prev_phase = bar.raw_phase
+        self.prev_dPOC = bar.dPOC
+        self.prev_phase = bar.raw_phase
 
-    return stats
+    def finalize(self) -> Dict:
+        return self.stats
 
 
-def compute_failed_auction_analysis(bars: List[BarState]) -> Dict:
-    """Analyze FAILED_AUCTION phase occurrences."""
-    stats = {
-        'total_bars': len(bars),
-        'raw_failed': 0,
-        'conf_failed': 0,
-        'failed_reasons': Counter(),
-        'failed_regime_context': Counter(),
-        'failed_when_at_boundary': 0,
-        'failed_when_outside_va': 0,
-        'failed_when_inside_va': 0,
-        'failed_when_unknown': 0,
-        'failed_streak_distribution': Counter(),
-        'conf_failed_examples': [],
-    }
-
+def compute_pullback_predicates(bars: List[BarState]) -> Dict:
+    """Compute PULLBACK predicate breakdown."""
+    acc = PullbackAccumulator()
     for bar in bars:
+        acc.update(bar)
+    return acc.finalize()
+
+
+# One captured CONF=FAILED_AUCTION bar (stats['conf_failed_examples'])
+FailedExample = namedtuple('FailedExample', 'bar price dPOC inVA atVAL atVAH reason regime')
+MAX_FAILED_EXAMPLES = 10
+
+
+class FailedAuctionAccumulator:
+    """FAILED_AUCTION occurrence analysis, built one bar at a time."""
+
+    def __init__(self):
+        self.stats = {
+            'total_bars': 0,
+            'raw_failed': 0,
+            'conf_failed': 0,
+            'failed_reasons': Counter(),
+            'failed_regime_context': Counter(),
+            'failed_when_at_boundary': 0,
+            'failed_when_outside_va': 0,
+            'failed_when_inside_va': 0,
+            'failed_when_unknown': 0,
+            'failed_streak_distribution': Counter(),
+            'conf_failed_examples': [],
+        }
+        self.captured = 0
+
+    def update(self, bar: BarState) -> None:
+        stats = self.stats
+        stats['total_bars'] += 1
+
         if bar.raw_phase == 'FAILED_AUCTION':
             stats['raw_failed'] += 1
 
@@ -303,212 +466,189 @@ def compute_failed_auction_analysis(bars: List[BarState]) -> Dict:
 
             stats['failed_streak_distribution'][bar.streak] += 1
 
-            if len(stats['conf_failed_examples']) < 10:
-                stats['conf_failed_examples'].append({
-                    'bar': bar.bar_num,
-                    'price': bar.price,
-                    'dPOC': bar.dPOC,
-                    'inVA': bar.inVA,
-                    'atVAL': bar.atVAL,
-                    'atVAH': bar.atVAH,
-                    'reason': bar.phase_reason,
-                    'regime': bar.conf_regime,
-                })
-
-    return stats
-
-
-def get_pullback_examples(filepath: str, count: int = 5) -> List[str]:
-    """Get representative log excerpts for PULLBACK analysis."""
-    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-        lines = f.readlines()
-
-    examples = []
-    i = 0
-    while i < len(lines) and len(examples) < count:
-        if 'RAW=PULLBACK' in lines[i]:
-            # Get context (2 lines before, this line, 2 lines after)
-            start = max(0, i - 2)
-            end = min(len(lines), i + 3)
-            excerpt = ''.join(lines[start:end])
-            examples.append(excerpt.strip())
-            i = end  # Skip ahead
-        else:
-            i += 1
+            if self.captured < MAX_FAILED_EXAMPLES:
+                stats['conf_failed_examples'].append(FailedExample(
+                    bar.bar_num, bar.price, bar.dPOC, bar.inVA, bar.atVAL, bar.atVAH,
+                    bar.phase_reason, bar.conf_regime))
+                self.captured += 1
 
-    return examples
+    def finalize(self) -> Dict:
+        return self.stats
 
 
-def get_failed_examples(filepath: str, count: int = 5) -> List[str]:
-    """Get representative log excerpts for FAILED_AUCTION analysis."""
-    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-        lines = f.readlines()
+def compute_failed_auction_analysis(bars: List[BarState]) -> Dict:
+    """Analyze FAILED_AUCTION phase occurrences."""
+    acc = FailedAuctionAccumulator()
+    for bar in bars:
+        acc.update(bar)
+    return acc.finalize()
 
-    examples = []
-    i = 0
-    while i < len(lines) and len(examples) < count:
-        if 'CONF=FAILED_AUCTION' in lines[i]:
-            start = max(0, i - 2)
-            end = min(len(lines), i + 3)
-            excerpt = ''.join(lines[start:end])
-            examples.append(excerpt.strip())
-            i = end
-        else:
-            i += 1
 
-    return examples
+# Report layout: rules and %-templates shared by the table rows
+_RULE = "-" * 90
+_DOUBLE_RULE = "=" * 90
+_HDR30_TMPL = "  %-30s %10s %10s"
+_HDR40_TMPL = "  %-40s %10s %10s"
+_DASHES30 = "  %s %s %s" % ('-' * 30, '-' * 10, '-' * 10)
+_DASHES40 = "  %s %s %s" % ('-' * 40, '-' * 10, '-' * 10)
+_ROW30_TMPL = "  %-30s %10d %9.1f%%"
+_ROW40_TMPL = "  %-40s %10d %9.1f%%"
+_STREAK_TMPL = "    streak=%s: %s bars"
+_COUNT_TMPL = "    %s: %s"
+_COUNT_PCT_TMPL = "    %s: %s (%.1f%%)"
 
 
-def generate_report(bars: List[BarState], pullback_stats: Dict, failed_stats: Dict,
-                   pullback_examples: List[str], failed_examples: List[str]) -> str:
-    """Generate attribution report."""
-    lines = []
-    lines.append("=" * 90)
-    lines.append("PHASE SYSTEM v2 - ATTRIBUTION REPORT")
-    lines.append("=" * 90)
-    lines.append("")
+def _iter_report_lines(pullback_stats: Dict, failed_stats: Dict,
+                       pullback_examples: List[str], failed_examples: List[str]) -> Iterator[str]:
+    """Yield attribution report lines one at a time."""
+    yield from (_DOUBLE_RULE, "PHASE SYSTEM v2 - ATTRIBUTION REPORT", _DOUBLE_RULE, "")
 
     # TABLE 1: PULLBACK Predicates
-    lines.append("-" * 90)
-    lines.append("TABLE 1: PULLBACK PREDICATE ANALYSIS")
-    lines.append("-" * 90)
-    lines.append("")
+    yield from (_RULE, "TABLE 1: PULLBACK PREDICATE ANALYSIS", _RULE, "")
     total = pullback_stats['total_bars']
-    lines.append(f"  {'Predicate':<30} {'Count':>10} {'Percent':>10}")
-    lines.append(f"  {'-'*30} {'-'*10} {'-'*10}")
-    lines.append(f"  {'Total bars analyzed':<30} {total:>10} {'100.0%':>10}")
-    lines.append(f"  {'outsideVA':<30} {pullback_stats['outsideVA']:>10} {100*pullback_stats['outsideVA']/total:>9.1f}%")
-    lines.append(f"  {'approachingPOC':<30} {pullback_stats['approachingPOC']:>10} {100*pullback_stats['approachingPOC']/total:>9.1f}%")
-    lines.append(f"  {'wasDirectionalRecently':<30} {pullback_stats['wasDirectionalRecently']:>10} {100*pullback_stats['wasDirectionalRecently']/total:>9.1f}%")
-    lines.append(f"  {'all_three (conjunctive)':<30} {pullback_stats['all_three']:>10} {100*pullback_stats['all_three']/total:>9.1f}%")
-    lines.append("")
-    lines.append(f"  {'RAW=PULLBACK detected':<30} {pullback_stats['raw_pullback']:>10} {100*pullback_stats['raw_pullback']/total:>9.1f}%")
-    lines.append(f"  {'CONF=PULLBACK confirmed':<30} {pullback_stats['conf_pullback']:>10} {100*pullback_stats['conf_pullback']/total:>9.1f}%")
-    lines.append("")
+    yield from (
+        _HDR30_TMPL % ('Predicate', 'Count', 'Percent'),
+        _DASHES30,
+        _HDR30_TMPL % ('Total bars analyzed', total, '100.0%'),
+    )
+    for label, key in (('outsideVA', 'outsideVA'),
+                       ('approachingPOC', 'approachingPOC'),
+                       ('wasDirectionalRecently', 'wasDirectionalRecently'),
+                       ('all_three (conjunctive)', 'all_three')):
+        yield _ROW30_TMPL % (label, pullback_stats[key], 100 * pullback_stats[key] / total)
+    yield ""
+    yield _ROW30_TMPL % ('RAW=PULLBACK detected', pullback_stats['raw_pullback'],
+                         100 * pullback_stats['raw_pullback'] / total)
+    yield _ROW30_TMPL % ('CONF=PULLBACK confirmed', pullback_stats['conf_pullback'],
+                         100 * pullback_stats['conf_pullback'] / total)
+    yield ""
 
     # TABLE 2: PULLBACK Suppression
-    lines.append("-" * 90)
-    lines.append("TABLE 2: PULLBACK SUPPRESSION ANALYSIS (for bars where all_three=true)")
-    lines.append("-" * 90)
-    lines.append("")
+    yield from (_RULE, "TABLE 2: PULLBACK SUPPRESSION ANALYSIS (for bars where all_three=true)", _RULE, "")
     all3 = pullback_stats['all_three']
     if all3 > 0:
-        lines.append(f"  {'Suppression Cause':<40} {'Count':>10} {'Percent':>10}")
-        lines.append(f"  {'-'*40} {'-'*10} {'-'*10}")
-        lines.append(f"  {'suppressed_by_testingBoundary':<40} {pullback_stats['suppressed_by_testingBoundary']:>10} {100*pullback_stats['suppressed_by_testingBoundary']/all3:>9.1f}%")
-        lines.append(f"  {'suppressed_by_extension':<40} {pullback_stats['suppressed_by_extension']:>10} {100*pullback_stats['suppressed_by_extension']/all3:>9.1f}%")
-        lines.append(f"  {'suppressed_by_trending':<40} {pullback_stats['suppressed_by_trending']:>10} {100*pullback_stats['suppressed_by_trending']/all3:>9.1f}%")
-        lines.append(f"  {'suppressed_by_other':<40} {pullback_stats['suppressed_by_other']:>10} {100*pullback_stats['suppressed_by_other']/all3:>9.1f}%")
-        lines.append(f"  {'eligible_for_pullback':<40} {pullback_stats['eligible_for_pullback']:>10} {100*pullback_stats['eligible_for_pullback']/all3:>9.1f}%")
+        yield from (_HDR40_TMPL % ('Suppression Cause', 'Count', 'Percent'), _DASHES40)
+        for key in ('suppressed_by_testingBoundary', 'suppressed_by_extension',
+                    'suppressed_by_trending', 'suppressed_by_other', 'eligible_for_pullback'):
+            yield _ROW40_TMPL % (key, pullback_stats[key], 100 * pullback_stats[key] / all3)
     else:
-        lines.append("  No bars with all three predicates true.")
-    lines.append("")
+        yield "  No bars with all three predicates true."
+    yield ""
 
     # Streak distribution
-    lines.append("  PULLBACK Streak Distribution (RAW=PULLBACK bars):")
+    yield "  PULLBACK Streak Distribution (RAW=PULLBACK bars):"
     for streak, count in sorted(pullback_stats['pullback_streak_distribution'].items()):
-        lines.append(f"    streak={streak}: {count} bars")
-    lines.append("")
+        yield _STREAK_TMPL % (streak, count)
+    yield ""
 
-    lines.append("  PULLBACK Interrupted By (when streak resets to 1):")
+    yield "  PULLBACK Interrupted By (when streak resets to 1):"
     for phase, count in pullback_stats['pullback_interrupted_by'].most_common():
-        lines.append(f"    {phase}: {count}")
-    lines.append("")
+        yield _COUNT_TMPL % (phase, count)
+    yield ""
 
     # TABLE 3: FAILED_AUCTION Analysis
-    lines.append("-" * 90)
-    lines.append("TABLE 3: FAILED_AUCTION CAUSE ANALYSIS")
-    lines.append("-" * 90)
-    lines.append("")
-    lines.append(f"  {'Metric':<40} {'Count':>10} {'Percent':>10}")
-    lines.append(f"  {'-'*40} {'-'*10} {'-'*10}")
-    lines.append(f"  {'RAW=FAILED_AUCTION':<40} {failed_stats['raw_failed']:>10} {100*failed_stats['raw_failed']/total:>9.1f}%")
-    lines.append(f"  {'CONF=FAILED_AUCTION':<40} {failed_stats['conf_failed']:>10} {100*failed_stats['conf_failed']/total:>9.1f}%")
-    lines.append("")
+    yield from (_RULE, "TABLE 3: FAILED_AUCTION CAUSE ANALYSIS", _RULE, "")
+    yield from (
+        _HDR40_TMPL % ('Metric', 'Count', 'Percent'),
+        _DASHES40,
+        _ROW40_TMPL % ('RAW=FAILED_AUCTION', failed_stats['raw_failed'], 100 * failed_stats['raw_failed'] / total),
+        _ROW40_TMPL % ('CONF=FAILED_AUCTION', failed_stats['conf_failed'], 100 * failed_stats['conf_failed'] / total),
+        "",
+    )
 
     conf_fail = failed_stats['conf_failed']
     if conf_fail > 0:
-        lines.append("  FAILED_AUCTION by Phase Reason:")
+        yield "  FAILED_AUCTION by Phase Reason:"
         for reason, count in failed_stats['failed_reasons'].most_common():
-            lines.append(f"    {reason}: {count} ({100*count/conf_fail:.1f}%)")
-        lines.append("")
+            yield _COUNT_PCT_TMPL % (reason, count, 100 * count / conf_fail)
+        yield ""
 
-        lines.append("  FAILED_AUCTION by Regime Context:")
+        yield "  FAILED_AUCTION by Regime Context:"
         for regime, count in failed_stats['failed_regime_context'].most_common():
-            lines.append(f"    {regime}: {count} ({100*count/conf_fail:.1f}%)")
-        lines.append("")
-
-        lines.append("  FAILED_AUCTION Location (inferred from reasons):")
-        lines.append(f"    At VA boundary (atVAL/atVAH): {failed_stats['failed_when_at_boundary']} ({100*failed_stats['failed_when_at_boundary']/conf_fail:.1f}%)")
-        lines.append(f"    Outside VA: {failed_stats['failed_when_outside_va']} ({100*failed_stats['failed_when_outside_va']/conf_fail:.1f}%)")
-        lines.append(f"    Inside VA: {failed_stats['failed_when_inside_va']} ({100*failed_stats['failed_when_inside_va']/conf_fail:.1f}%)")
+            yield _COUNT_PCT_TMPL % (regime, count, 100 * count / conf_fail)
+        yield ""
+
+        yield "  FAILED_AUCTION Location (inferred from reasons):"
+        for label, key in (('At VA boundary (atVAL/atVAH)', 'failed_when_at_boundary'),
+                           ('Outside VA', 'failed_when_outside_va'),
+                           ('Inside VA', 'failed_when_inside_va')):
+            yield _COUNT_PCT_TMPL % (label, failed_stats[key], 100 * failed_stats[key] / conf_fail)
         if failed_stats['failed_when_unknown'] > 0:
-            lines.append(f"    Unknown: {failed_stats['failed_when_unknown']} ({100*failed_stats['failed_when_unknown']/conf_fail:.1f}%)")
-        lines.append("")
+            yield _COUNT_PCT_TMPL % ('Unknown', failed_stats['failed_when_unknown'],
+                                     100 * failed_stats['failed_when_unknown'] / conf_fail)
+        yield ""
 
-        lines.append("  FAILED_AUCTION Streak Distribution:")
+        yield "  FAILED_AUCTION Streak Distribution:"
         for streak, count in sorted(failed_stats['failed_streak_distribution'].items()):
-            lines.append(f"    streak={streak}: {count} bars")
-    lines.append("")
+            yield _STREAK_TMPL % (streak, count)
+    yield ""
 
     # DIAGNOSIS
-    lines.append("-" * 90)
-    lines.append("DIAGNOSIS")
-    lines.append("-" * 90)
-    lines.append("")
+    yield from (_RULE, "DIAGNOSIS", _RULE, "")
 
     # PULLBACK diagnosis
-    lines.append("PULLBACK UNREACHABILITY CAUSE:")
+    yield "PULLBACK UNREACHABILITY CAUSE:"
     if pullback_stats['raw_pullback'] == 0:
-        lines.append("  (a) One predicate never true: RAW=PULLBACK never detected")
+        yield "  (a) One predicate never true: RAW=PULLBACK never detected"
         if pullback_stats['outsideVA'] == 0:
-            lines.append("      -> outsideVA is always false")
+            yield "      -> outsideVA is always false"
         if pullback_stats['approachingPOC'] == 0:
-            lines.append("      -> approachingPOC is always false")
+            yield "      -> approachingPOC is always false"
         if pullback_stats['wasDirectionalRecently'] == 0:
-            lines.append("      -> wasDirectionalRecently is always false")
+            yield "      -> wasDirectionalRecently is always false"
     elif pullback_stats['conf_pullback'] == 0 and pullback_stats['raw_pullback'] > 0:
         max_streak = max(pullback_stats['pullback_streak_distribution'].keys()) if pullback_stats['pullback_streak_distribution'] else 0
         if max_streak < 3:
-            lines.append(f"  (c) Confirmation/hysteresis: RAW=PULLBACK detected {pullback_stats['raw_pullback']} times")
-            lines.append(f"      but max streak={max_streak} < minConfirmationBars=3")
-            lines.append("      -> PULLBACK gets interrupted before reaching confirmation threshold")
+            yield f"  (c) Confirmation/hysteresis: RAW=PULLBACK detected {pullback_stats['raw_pullback']} times"
+            yield f"      but max streak={max_streak} < minConfirmationBars=3"
+            yield "      -> PULLBACK gets interrupted before reaching confirmation threshold"
         else:
-            lines.append("  (b) Priority suppression: Higher-priority phases override PULLBACK")
-    lines.append("")
+            yield "  (b) Priority suppression: Higher-priority phases override PULLBACK"
+    yield ""
 
     # FAILED_AUCTION diagnosis
-    lines.append("FAILED_AUCTION ELEVATION CAUSE:")
+    yield "FAILED_AUCTION ELEVATION CAUSE:"
     if conf_fail > 0:
         top_reason = failed_stats['failed_reasons'].most_common(1)[0] if failed_stats['failed_reasons'] else ('UNKNOWN', 0)
-        lines.append(f"  Primary cause: {top_reason[0]} ({top_reason[1]} bars, {100*top_reason[1]/conf_fail:.1f}%)")
+        yield f"  Primary cause: {top_reason[0]} ({top_reason[1]} bars, {100*top_reason[1]/conf_fail:.1f}%)"
 
         if 'EXTREME' in str(top_reason[0]).upper() or 'NEW_EXTREME' in str(top_reason[0]).upper():
-            lines.append("  -> FAIL IS being set by 'new extreme recently' logic")
+            yield "  -> FAIL IS being set by 'new extreme recently' logic"
         else:
-            lines.append("  -> FAIL is NOT being set by 'new extreme recently' logic")
-    lines.append("")
+            yield "  -> FAIL is NOT being set by 'new extreme recently' logic"
+    yield ""
 
     # EXAMPLES
-    lines.append("-" * 90)
-    lines.append("REPRESENTATIVE LOG EXCERPTS - PULLBACK")
-    lines.append("-" * 90)
+    yield from (_RULE, "REPRESENTATIVE LOG EXCERPTS - PULLBACK", _RULE)
     for i, ex in enumerate(pullback_examples, 1):
-        lines.append(f"\n[PULLBACK Example {i}]")
-        lines.append(ex)
-    lines.append("")
+        yield from ("\n[PULLBACK Example %d]" % i, ex)
+    yield ""
 
-    lines.append("-" * 90)
-    lines.append("REPRESENTATIVE LOG EXCERPTS - FAILED_AUCTION")
-    lines.append("-" * 90)
+    yield from (_RULE, "REPRESENTATIVE LOG EXCERPTS - FAILED_AUCTION", _RULE)
     for i, ex in enumerate(failed_examples, 1):
-        lines.append(f"\n[FAILED_AUCTION Example {i}]")
-        lines.append(ex)
-    lines.append("")
+        yield from ("\n[FAILED_AUCTION Example %d]" % i, ex)
+    yield ""
 
-    lines.append("=" * 90)
+    yield _DOUBLE_RULE
 
-    return "\n".join(lines)
+
+def generate_report(bars: List[BarState], pullback_stats: Dict, failed_stats: Dict,
+                   pullback_examples: List[str], failed_examples: List[str]) -> str:
+    """Generate attribution report."""
+    return "\n".join(_iter_report_lines(pullback_stats, failed_stats,
+                                         pullback_examples, failed_examples))
+
+
+def write_report(out: TextIO, pullback_stats: Dict, failed_stats: Dict,
+                 pullback_examples: List[str], failed_examples: List[str]) -> None:
+    """Write the attribution report to out without building it in memory."""
+    first = True
+    for line in _iter_report_lines(pullback_stats, failed_stats,
+                                   pullback_examples, failed_examples):
+        if not first:
+            out.write("\n")
+        out.write(line)
+        first = False
 
 
 def main():
@@ -526,24 +666,31 @@ def main():
 
     print(f"Analyzing: {input_file}")
 
-    bars, _ = analyze_logs(input_file)
-    print(f"Parsed {len(bars)} bar states")
-
-    pullback_stats = compute_pullback_predicates(bars)
-    failed_stats = compute_failed_auction_analysis(bars)
+    # One pass over the log feeds both analyses and collects the excerpts
+    pullback_collector = ExampleCollector('RAW=PULLBACK', 5)
+    failed_collector = ExampleCollector('CONF=FAILED_AUCTION', 5)
+    pullback_acc = PullbackAccumulator()
+    failed_acc = FailedAuctionAccumulator()
+    for bar in iter_bars(input_file, (pullback_collector, failed_collector)):
+        pullback_acc.update(bar)
+        failed_acc.update(bar)
 
-    pullback_examples = get_pullback_examples(input_file, 5)
-    failed_examples = get_failed_examples(input_file, 5)
+    pullback_stats = pullback_acc.finalize()
+    failed_stats = failed_acc.finalize()
+    print(f"Parsed {pullback_stats['total_bars']} bar states")
 
-    report = generate_report(bars, pullback_stats, failed_stats,
-                            pullback_examples, failed_examples)
+    pullback_examples = pullback_collector.finish()
+    failed_examples = failed_collector.finish()
 
+    # Stream the report straight to its destination
     if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(report)
+        with open(output_file, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            write_report(f, pullback_stats, failed_stats,
+                         pullback_examples, failed_examples)
         print(f"Report written to: {output_file}")
     else:
-        print(report)
+        sys.stdout.writelines(line + "\n" for line in _iter_report_lines(
+            pullback_stats, failed_stats, pullback_examples, failed_examples))
 
 
 if __name__ == "__main__":
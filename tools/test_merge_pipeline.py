@@ -5,29 +5,48 @@ Test Suite for Merge Pipeline — Spec v1.1
 Tests T01-T21 as defined in the test suite design.
 """
 
+import contextlib
 import csv
+import functools
+import hashlib
+import io
 import json
 import os
 import tempfile
 import shutil
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, FrozenSet, NamedTuple, Optional, Tuple
 import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import merge_pipeline
+from merge_pipeline import MergePipeline
 
 # Path to the pipeline script
 PIPELINE_SCRIPT = Path(__file__).parent / 'merge_pipeline.py'
 
 
+class _TestAbort(Exception):
+    """Raised by TestResult.fail() to stop a test at its first failed check."""
+
+    def __init__(self, result: 'TestResult'):
+        super().__init__(result.test_id)
+        self.result = result
+
+
 class TestResult:
     def __init__(self, test_id: str):
         self.test_id = test_id
-        self.passed = False
         self.errors: List[str] = []
 
+    @property
+    def passed(self) -> bool:
+        return not self.errors
+
     def fail(self, msg: str):
-        self.passed = False
         self.errors.append(msg)
+        raise _TestAbort(self)
 
     def __str__(self):
         status = "PASS" if self.passed else "FAIL"
@@ -37,13 +56,36 @@ class TestResult:
         return result
 
 
-def write_csv(path: Path, headers: List[str], rows: List[Dict]):
-    """Write test input CSV."""
-    with open(path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=headers)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(row)
+# Characters that make csv.writer quote a field (delimiter, quotechar, line terminator)
+_CSV_SPECIAL = frozenset(',"\r\n')
+
+
+@functools.lru_cache(maxsize=None)
+def _serialize_csv(headers: Tuple[str, ...], rows: Tuple[Tuple[str, ...], ...]) -> bytes:
+    """Serialize header + rows to CSV bytes (cached per unique input)."""
+    lines = (headers,) + rows
+    # Fixture values rarely need quoting: plain joins then match csv.writer byte for byte
+    # (a lone empty field is the exception, csv.writer writes it as "")
+    if len(headers) > 1 and not any(_CSV_SPECIAL.intersection(v) for line in lines for v in line):
+        return ''.join(','.join(line) + '\r\n' for line in lines).encode('utf-8')
+
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(headers)
+    writer.writerows(rows)
+    return buf.getvalue().encode('utf-8')
+
+
+def write_csv(path: Path, headers: List[str], rows: List) -> bytes:
+    """Write test input CSV and return the bytes written.
+
+    rows are dicts keyed by header, or tuples already in headers order.
+    """
+    key = tuple(row if isinstance(row, tuple) else tuple(row.get(h, '') for h in headers)
+                for row in rows)
+    data = _serialize_csv(tuple(headers), key)
+    path.write_bytes(data)
+    return data
 
 
 def read_csv(path: Path) -> List[Dict]:
@@ -51,29 +93,185 @@ def read_csv(path: Path) -> List[Dict]:
     if not path.exists():
         return []
     with open(path, 'r', newline='', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return []
+        # Pipeline output rows are always full width, so zip replaces DictReader
+        return [dict(zip(header, row)) for row in reader]
+
+
+def _file_digest(path: Path) -> bytes:
+    """SHA-256 of a file's raw bytes; a missing file hashes like an empty one."""
+    return hashlib.sha256(path.read_bytes() if path.exists() else b'').digest()
 
 
 def run_pipeline(input_path: Path, output_dir: Path) -> int:
-    """Run the pipeline and return exit code."""
+    """Run the pipeline's command-line entry point in-process and return its exit code."""
+    saved_argv = sys.argv
+    sys.argv = [str(PIPELINE_SCRIPT), str(input_path), str(output_dir)]
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            merge_pipeline.main()
+    except SystemExit as exit_:
+        return exit_.code  # main() always exits with an int status
+    finally:
+        sys.argv = saved_argv
+    return 0
+
+
+def run_pipeline_subprocess(input_path: Path, output_dir: Path, hash_seed: int) -> int:
+    """Run the pipeline in a fresh interpreter with the given PYTHONHASHSEED; return exit code.
+
+    A separate process gets its own hash seed and module state, so comparing two such
+    runs catches output that depends on set/dict hash ordering.
+    """
     result = subprocess.run(
         [sys.executable, str(PIPELINE_SCRIPT), str(input_path), str(output_dir)],
         capture_output=True,
-        text=True
+        text=True,
+        env={**os.environ, 'PYTHONHASHSEED': str(hash_seed)},
     )
     return result.returncode
 
 
+class PipelineRun(NamedTuple):
+    """Exit code and parsed outputs of one pipeline run."""
+    exit_code: int
+    contexts: List[Dict]
+    engagements: List[Dict]
+    errors: List[Dict]
+    error_keys: FrozenSet[Tuple[str, str]]  # (error_type, severity) of every error row
+
+    @classmethod
+    def build(cls, exit_code: int, contexts: List[Dict], engagements: List[Dict],
+              errors: List[Dict]) -> 'PipelineRun':
+        keys = frozenset((e['error_type'], e['severity']) for e in errors)
+        return cls(exit_code, contexts, engagements, errors, keys)
+
+
+def run_pipeline_inproc(input_path: Path) -> PipelineRun:
+    """Run the pipeline in this process, skipping output files.
+
+    Rows come back as the same string dicts read_csv() yields for the CSVs.
+    """
+    pipeline = MergePipeline(str(input_path), '', write_outputs=False)
+    exit_code = pipeline.run()
+    return PipelineRun.build(
+        exit_code,
+        [ctx.to_dict() for ctx in pipeline.contexts],
+        [eng.to_dict() for eng in pipeline.engagements],
+        [err.to_dict() for err in pipeline.errors],
+    )
+
+
+# In-process results by input content hash, so byte-identical scenarios run once.
+# Set MERGE_TESTS_NO_CACHE=1 to run the pipeline for every scenario.
+USE_RUN_CACHE = not os.environ.get('MERGE_TESTS_NO_CACHE')
+_RUN_CACHE: Dict[bytes, PipelineRun] = {}
+
+
+def run_scenario(tmp_dir: Path, input_rows: List['InputRow'], suffix: str = '',
+                 cli: bool = False) -> PipelineRun:
+    """Write input_rows, run the pipeline once and collect all of its outputs.
+
+    cli=True goes through the script's main() with real output files and
+    reads back the CSVs (never cached); otherwise the pipeline object runs
+    directly without writing outputs.
+    """
+    input_path = tmp_dir / f'input{suffix}.csv'
+    data = write_csv(input_path, FULL_HEADERS, input_rows)
+
+    if not cli:
+        if not USE_RUN_CACHE:
+            return run_pipeline_inproc(input_path)
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        run = _RUN_CACHE.get(digest)
+        if run is None:
+            run = _RUN_CACHE[digest] = run_pipeline_inproc(input_path)
+        return run
+
+    output_dir = tmp_dir / f'output{suffix}'
+    exit_code = run_pipeline(input_path, output_dir)
+
+    return PipelineRun.build(
+        exit_code,
+        read_csv(output_dir / 'context.csv'),
+        read_csv(output_dir / 'engagement.csv'),
+        read_csv(output_dir / 'error.csv'),
+    )
+
+
 # =============================================================================
 # STANDARD HEADERS
 # =============================================================================
 
-FULL_HEADERS = [
-    'session_id', 'session_type', 'ts', 'bar', 'event_type',
-    'zone_id', 'zone_type', 'entry_price', 'exit_price', 'bars',
-    'outcome', 'escape_vel', 'vol_ratio', 'aggression', 'facilitation',
-    'market_state', 'phase', 'message'
-]
+class InputRow(NamedTuple):
+    """One pipeline input row; field order is the CSV column order."""
+    session_id: str = ''
+    session_type: str = ''
+    ts: str = ''
+    bar: str = ''
+    event_type: str = ''
+    zone_id: str = ''
+    zone_type: str = ''
+    entry_price: str = ''
+    exit_price: str = ''
+    bars: str = ''
+    outcome: str = ''
+    escape_vel: str = ''
+    vol_ratio: str = ''
+    aggression: str = ''
+    facilitation: str = ''
+    market_state: str = ''
+    phase: str = ''
+    message: str = ''
+
+
+FULL_HEADERS = list(InputRow._fields)
+
+# Every column empty; rows override only the fields they care about
+BLANK_ROW = InputRow()
+
+
+def _mk(base: InputRow = BLANK_ROW, /, **fields) -> InputRow:
+    """Build an input row: base (default BLANK_ROW) with the given fields set."""
+    return base._replace(**fields)
+
+
+# Templates for the three event types; rows start from one and override fields
+BASE_SNAPSHOT = _mk(session_id='1', session_type='GLOBEX', ts='2025-01-01 09:00', bar='100',
+                    event_type='PHASE_SNAPSHOT', zone_id='-1', zone_type='NONE', entry_price='0',
+                    exit_price='0', bars='0', escape_vel='0', vol_ratio='0')
+BASE_MODE_LOCK = _mk(session_id='1', session_type='GLOBEX', ts='2025-01-01 09:00', bar='100',
+                     event_type='MODE_LOCK', zone_id='0', entry_price='0', exit_price='0',
+                     bars='0', escape_vel='0', vol_ratio='0')
+BASE_ENGAGEMENT = _mk(session_id='1', session_type='GLOBEX', ts='2025-01-01 09:00', bar='100',
+                      event_type='ENGAGEMENT_FINAL', zone_id='3', zone_type='VPB_VAL',
+                      entry_price='6000', exit_price='6001', bars='5', outcome='TEST',
+                      escape_vel='0.5', vol_ratio='0.8')
+
+
+# Complete session 1 context at bar 100 (ROTATION snapshot + BALANCE lock),
+# shared by the tests that only vary the engagement that follows it
+CONTEXT_PREFIX = (
+    _mk(BASE_SNAPSHOT, phase='ROTATION', message='msg'),
+    _mk(BASE_MODE_LOCK, aggression='RESPONSIVE', facilitation='EFFICIENT',
+        market_state='BALANCE', phase='ROTATION', message='raw:X'),
+)
+
+
+# Output field values and _flags entries the tests assert on
+TRUE = 'TRUE'
+FALSE = 'FALSE'
+FLAG_ORPHAN = 'ORPHAN'
+FLAG_STALE = 'STALE_CONTEXT'
+FLAG_PARTIAL = 'PARTIAL_CONTEXT'
+
+
+def _flags(eng: Dict) -> FrozenSet[str]:
+    """The engagement's comma-separated _flags as a set."""
+    return frozenset(filter(None, eng['_flags'].split(',')))
 
 
 # =============================================================================
@@ -85,67 +283,47 @@ def test_t01_happy_path_complete(tmp_dir: Path) -> TestResult:
     result = TestResult("T01")
 
     input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': 'AT_BOUNDARY', 'message': 'BASE|test'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'MODE_LOCK', 'zone_id': '0', 'zone_type': '',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': 'RESPONSIVE', 'facilitation': 'EFFICIENT',
-         'market_state': 'BALANCE', 'phase': 'ROTATION', 'message': 'raw:BALANCE'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:05', 'bar': '105',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000.00', 'exit_price': '6001.00', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.50', 'vol_ratio': '0.80', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
+        _mk(BASE_SNAPSHOT, phase='AT_BOUNDARY', message='BASE|test'),
+        _mk(BASE_MODE_LOCK, aggression='RESPONSIVE', facilitation='EFFICIENT',
+            market_state='BALANCE', phase='ROTATION', message='raw:BALANCE'),
+        _mk(BASE_ENGAGEMENT, ts='2025-01-01 09:05', bar='105', entry_price='6000.00',
+            exit_price='6001.00', escape_vel='0.50', vol_ratio='0.80'),
     ]
 
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
+    run = run_scenario(tmp_dir, input_rows, cli=True)
 
     # Check exit code
-    if exit_code != 0:
-        result.fail(f"Expected exit code 0, got {exit_code}")
-        return result
+    if run.exit_code != 0:
+        result.fail(f"Expected exit code 0, got {run.exit_code}")
 
     # Check context.csv
-    contexts = read_csv(output_dir / 'context.csv')
-    if len(contexts) != 1:
-        result.fail(f"Expected 1 context row, got {len(contexts)}")
-    else:
-        ctx = contexts[0]
-        if ctx['context_complete'] != 'TRUE':
-            result.fail(f"Expected context_complete=TRUE, got {ctx['context_complete']}")
-        if ctx['phase'] != 'AT_BOUNDARY':
-            result.fail(f"Expected phase=AT_BOUNDARY, got {ctx['phase']}")
-        if ctx['aggression'] != 'RESPONSIVE':
-            result.fail(f"Expected aggression=RESPONSIVE, got {ctx['aggression']}")
+    if len(run.contexts) != 1:
+        result.fail(f"Expected 1 context row, got {len(run.contexts)}")
+
+    ctx = run.contexts[0]
+    if ctx['context_complete'] != TRUE:
+        result.fail(f"Expected context_complete=TRUE, got {ctx['context_complete']}")
+    if ctx['phase'] != 'AT_BOUNDARY':
+        result.fail(f"Expected phase=AT_BOUNDARY, got {ctx['phase']}")
+    if ctx['aggression'] != 'RESPONSIVE':
+        result.fail(f"Expected aggression=RESPONSIVE, got {ctx['aggression']}")
 
     # Check engagement.csv
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 1:
-        result.fail(f"Expected 1 engagement row, got {len(engagements)}")
-    else:
-        eng = engagements[0]
-        if eng['context_bar'] != '100':
-            result.fail(f"Expected context_bar=100, got {eng['context_bar']}")
-        if eng['context_stale'] != 'FALSE':
-            result.fail(f"Expected context_stale=FALSE, got {eng['context_stale']}")
-        if eng['orphan'] != 'FALSE':
-            result.fail(f"Expected orphan=FALSE, got {eng['orphan']}")
+    if len(run.engagements) != 1:
+        result.fail(f"Expected 1 engagement row, got {len(run.engagements)}")
+
+    eng = run.engagements[0]
+    if eng['context_bar'] != '100':
+        result.fail(f"Expected context_bar=100, got {eng['context_bar']}")
+    if eng['context_stale'] != FALSE:
+        result.fail(f"Expected context_stale=FALSE, got {eng['context_stale']}")
+    if eng['orphan'] != FALSE:
+        result.fail(f"Expected orphan=FALSE, got {eng['orphan']}")
 
     # Check error.csv is empty
-    errors = read_csv(output_dir / 'error.csv')
-    if len(errors) != 0:
-        result.fail(f"Expected 0 errors, got {len(errors)}")
+    if len(run.errors) != 0:
+        result.fail(f"Expected 0 errors, got {len(run.errors)}")
 
-    if not result.errors:
-        result.passed = True
     return result
 
 
@@ -154,441 +332,128 @@ def test_t02_multiple_sessions(tmp_dir: Path) -> TestResult:
     result = TestResult("T02")
 
     input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': 'ROTATION', 'message': 'msg1'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'MODE_LOCK', 'zone_id': '0', 'zone_type': '',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': 'RESPONSIVE', 'facilitation': 'EFFICIENT',
-         'market_state': 'BALANCE', 'phase': 'ROTATION', 'message': 'raw:BAL'},
-        {'session_id': '2', 'session_type': 'RTH', 'ts': '2025-01-01 09:30', 'bar': '50',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '1', 'zone_type': 'VPB_POC',
-         'entry_price': '5000.00', 'exit_price': '5001.00', 'bars': '3', 'outcome': 'ACCEPT',
-         'escape_vel': '1.00', 'vol_ratio': '0.50', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
+        _mk(BASE_SNAPSHOT, phase='ROTATION', message='msg1'),
+        _mk(BASE_MODE_LOCK, aggression='RESPONSIVE', facilitation='EFFICIENT',
+            market_state='BALANCE', phase='ROTATION', message='raw:BAL'),
+        _mk(BASE_ENGAGEMENT, session_id='2', session_type='RTH', ts='2025-01-01 09:30',
+            bar='50', zone_id='1', zone_type='VPB_POC', entry_price='5000.00',
+            exit_price='5001.00', bars='3', outcome='ACCEPT', escape_vel='1.00',
+            vol_ratio='0.50'),
     ]
 
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
+    run = run_scenario(tmp_dir, input_rows)
 
-    exit_code = run_pipeline(input_path, output_dir)
-
-    if exit_code != 0:
-        result.fail(f"Expected exit code 0, got {exit_code}")
-        return result
+    if run.exit_code != 0:
+        result.fail(f"Expected exit code 0, got {run.exit_code}")
 
     # Check engagement is orphan (session 2 has no context)
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 1:
-        result.fail(f"Expected 1 engagement row, got {len(engagements)}")
-    else:
-        eng = engagements[0]
-        if eng['orphan'] != 'TRUE':
-            result.fail(f"Expected orphan=TRUE, got {eng['orphan']}")
-        if 'ORPHAN' not in eng['_flags']:
-            result.fail(f"Expected ORPHAN in _flags, got {eng['_flags']}")
-
-    if not result.errors:
-        result.passed = True
-    return result
-
-
-def test_t03_fatal_duplicate_snapshot(tmp_dir: Path) -> TestResult:
-    """T03: Fatal — DUPLICATE_CONTEXT_SNAPSHOT"""
-    result = TestResult("T03")
-
-    input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': 'msg1'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': 'msg2'},
-    ]
-
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
-
-    if exit_code != 2:
-        result.fail(f"Expected exit code 2, got {exit_code}")
-
-    errors = read_csv(output_dir / 'error.csv')
-    fatal_found = any(e['error_type'] == 'DUPLICATE_CONTEXT_SNAPSHOT' and e['severity'] == 'FATAL' for e in errors)
-    if not fatal_found:
-        result.fail("Expected DUPLICATE_CONTEXT_SNAPSHOT FATAL error")
-
-    if not result.errors:
-        result.passed = True
-    return result
-
-
-def test_t04_fatal_duplicate_lock(tmp_dir: Path) -> TestResult:
-    """T04: Fatal — DUPLICATE_CONTEXT_LOCK"""
-    result = TestResult("T04")
-
-    input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'MODE_LOCK', 'zone_id': '0', 'zone_type': '',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': 'RESPONSIVE', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': 'raw:A'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'MODE_LOCK', 'zone_id': '0', 'zone_type': '',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': 'INITIATIVE', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': 'raw:B'},
-    ]
-
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
-
-    if exit_code != 2:
-        result.fail(f"Expected exit code 2, got {exit_code}")
-
-    errors = read_csv(output_dir / 'error.csv')
-    fatal_found = any(e['error_type'] == 'DUPLICATE_CONTEXT_LOCK' and e['severity'] == 'FATAL' for e in errors)
-    if not fatal_found:
-        result.fail("Expected DUPLICATE_CONTEXT_LOCK FATAL error")
-
-    if not result.errors:
-        result.passed = True
-    return result
-
-
-def test_t05_fatal_identity_conflict(tmp_dir: Path) -> TestResult:
-    """T05: Fatal — IDENTITY_CONFLICT"""
-    result = TestResult("T05")
-
-    input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': 'msg'},
-        {'session_id': '1', 'session_type': 'RTH', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'MODE_LOCK', 'zone_id': '0', 'zone_type': '',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': 'raw:X'},
-    ]
-
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
-
-    if exit_code != 2:
-        result.fail(f"Expected exit code 2, got {exit_code}")
-
-    errors = read_csv(output_dir / 'error.csv')
-    fatal_found = any(e['error_type'] == 'IDENTITY_CONFLICT' and e['severity'] == 'FATAL' for e in errors)
-    if not fatal_found:
-        result.fail("Expected IDENTITY_CONFLICT FATAL error")
-
-    if not result.errors:
-        result.passed = True
-    return result
-
-
-def test_t06_fatal_missing_identity(tmp_dir: Path) -> TestResult:
-    """T06: Fatal — MISSING_IDENTITY"""
-    result = TestResult("T06")
-
-    input_rows = [
-        {'session_id': '', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': 'msg'},
-    ]
+    if len(run.engagements) != 1:
+        result.fail(f"Expected 1 engagement row, got {len(run.engagements)}")
 
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
+    eng = run.engagements[0]
+    if eng['orphan'] != TRUE:
+        result.fail(f"Expected orphan=TRUE, got {eng['orphan']}")
+    if FLAG_ORPHAN not in _flags(eng):
+        result.fail(f"Expected ORPHAN in _flags, got {eng['_flags']}")
 
-    if exit_code != 2:
-        result.fail(f"Expected exit code 2, got {exit_code}")
-
-    errors = read_csv(output_dir / 'error.csv')
-    fatal_found = any(e['error_type'] == 'MISSING_IDENTITY' and e['severity'] == 'FATAL' for e in errors)
-    if not fatal_found:
-        result.fail("Expected MISSING_IDENTITY FATAL error")
-
-    if not result.errors:
-        result.passed = True
     return result
 
 
-def test_t07_fatal_timestamp_inversion(tmp_dir: Path) -> TestResult:
-    """T07: Fatal — TIMESTAMP_INVERSION"""
-    result = TestResult("T07")
-
-    input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:30', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': 'msg1'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '101',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': 'msg2'},
-    ]
-
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
-
-    if exit_code != 2:
-        result.fail(f"Expected exit code 2, got {exit_code}")
-
-    errors = read_csv(output_dir / 'error.csv')
-    fatal_found = any(e['error_type'] == 'TIMESTAMP_INVERSION' and e['severity'] == 'FATAL' for e in errors)
-    if not fatal_found:
-        result.fail("Expected TIMESTAMP_INVERSION FATAL error")
-
-    if not result.errors:
-        result.passed = True
-    return result
-
-
-def test_t08_fatal_zone_type_inconsistency(tmp_dir: Path) -> TestResult:
-    """T08: Fatal — ZONE_TYPE_INCONSISTENCY"""
-    result = TestResult("T08")
-
-    input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:05', 'bar': '105',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'PRIOR_POC',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
-    ]
-
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
-
-    if exit_code != 2:
-        result.fail(f"Expected exit code 2, got {exit_code}")
-
-    errors = read_csv(output_dir / 'error.csv')
-    fatal_found = any(e['error_type'] == 'ZONE_TYPE_INCONSISTENCY' and e['severity'] == 'FATAL' for e in errors)
-    if not fatal_found:
-        result.fail("Expected ZONE_TYPE_INCONSISTENCY FATAL error")
-
-    if not result.errors:
-        result.passed = True
-    return result
-
-
-def test_t09_fatal_unsorted_input(tmp_dir: Path) -> TestResult:
-    """T09: Fatal — UNSORTED_INPUT"""
-    result = TestResult("T09")
-
-    input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:05', 'bar': '105',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': 'msg2'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': 'msg1'},
-    ]
-
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
-
-    if exit_code != 3:
-        result.fail(f"Expected exit code 3, got {exit_code}")
-
-    errors = read_csv(output_dir / 'error.csv')
-    fatal_found = any(e['error_type'] == 'UNSORTED_INPUT' and e['severity'] == 'FATAL' for e in errors)
-    if not fatal_found:
-        result.fail("Expected UNSORTED_INPUT FATAL error")
-
-    if not result.errors:
-        result.passed = True
-    return result
-
-
-def test_t10_recoverable_invalid_price(tmp_dir: Path) -> TestResult:
-    """T10: Recoverable — INVALID_ENGAGEMENT_PRICE"""
-    result = TestResult("T10")
-
-    input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '0', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
-    ]
-
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
-
-    if exit_code != 1:
-        result.fail(f"Expected exit code 1, got {exit_code}")
-
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 0:
-        result.fail(f"Expected 0 engagements (quarantined), got {len(engagements)}")
-
-    errors = read_csv(output_dir / 'error.csv')
-    recov_found = any(e['error_type'] == 'INVALID_ENGAGEMENT_PRICE' and e['severity'] == 'RECOVERABLE' for e in errors)
-    if not recov_found:
-        result.fail("Expected INVALID_ENGAGEMENT_PRICE RECOVERABLE error")
-
-    if not result.errors:
-        result.passed = True
-    return result
-
-
-def test_t11_recoverable_invalid_outcome(tmp_dir: Path) -> TestResult:
-    """T11: Recoverable — INVALID_OUTCOME"""
-    result = TestResult("T11")
-
-    input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'INVALID_VALUE',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
-    ]
-
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
-
-    if exit_code != 1:
-        result.fail(f"Expected exit code 1, got {exit_code}")
-
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 0:
-        result.fail(f"Expected 0 engagements (quarantined), got {len(engagements)}")
-
-    errors = read_csv(output_dir / 'error.csv')
-    recov_found = any(e['error_type'] == 'INVALID_OUTCOME' and e['severity'] == 'RECOVERABLE' for e in errors)
-    if not recov_found:
-        result.fail("Expected INVALID_OUTCOME RECOVERABLE error")
-
-    if not result.errors:
-        result.passed = True
-    return result
-
-
-def test_t12_recoverable_duplicate_engagement(tmp_dir: Path) -> TestResult:
-    """T12: Recoverable — DUPLICATE_ENGAGEMENT"""
-    result = TestResult("T12")
-
-    input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6002', 'bars': '6', 'outcome': 'ACCEPT',
-         'escape_vel': '0.6', 'vol_ratio': '0.9', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
-    ]
-
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
-
-    if exit_code != 1:
-        result.fail(f"Expected exit code 1, got {exit_code}")
-
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 1:
-        result.fail(f"Expected 1 engagement (first wins), got {len(engagements)}")
-    elif engagements[0]['outcome'] != 'TEST':
-        result.fail(f"Expected first row (outcome=TEST), got {engagements[0]['outcome']}")
-
-    errors = read_csv(output_dir / 'error.csv')
-    recov_found = any(e['error_type'] == 'DUPLICATE_ENGAGEMENT' and e['severity'] == 'RECOVERABLE' for e in errors)
-    if not recov_found:
-        result.fail("Expected DUPLICATE_ENGAGEMENT RECOVERABLE error")
-
-    if not result.errors:
-        result.passed = True
-    return result
+class ErrorScenario(NamedTuple):
+    """Input whose run must end with a given exit code and error rows.
+
+    Rows are ordered like their test IDs: FATAL (exit 2), input validation
+    (exit 3), then RECOVERABLE (exit 1).
+    """
+    test_id: str
+    expected_exit: int
+    expected_errors: Tuple[Tuple[str, str], ...]  # (error_type, severity) pairs
+    input_rows: List[InputRow]
+    expected_engagements: Optional[int] = None  # None: engagement output not checked
+    engagement_note: str = ''  # why that count, for the failure message
+    first_outcome: Optional[str] = None  # outcome of the surviving engagement row
+
+
+ERROR_SCENARIOS = [
+    # T03: Fatal — DUPLICATE_CONTEXT_SNAPSHOT
+    ErrorScenario('T03', 2, (('DUPLICATE_CONTEXT_SNAPSHOT', 'FATAL'),), [
+        _mk(BASE_SNAPSHOT, message='msg1'),
+        _mk(BASE_SNAPSHOT, message='msg2'),
+    ]),
+    # T04: Fatal — DUPLICATE_CONTEXT_LOCK
+    ErrorScenario('T04', 2, (('DUPLICATE_CONTEXT_LOCK', 'FATAL'),), [
+        _mk(BASE_MODE_LOCK, aggression='RESPONSIVE', message='raw:A'),
+        _mk(BASE_MODE_LOCK, aggression='INITIATIVE', message='raw:B'),
+    ]),
+    # T05: Fatal — IDENTITY_CONFLICT
+    ErrorScenario('T05', 2, (('IDENTITY_CONFLICT', 'FATAL'),), [
+        _mk(BASE_SNAPSHOT, message='msg'),
+        _mk(BASE_MODE_LOCK, session_type='RTH', message='raw:X'),
+    ]),
+    # T06: Fatal — MISSING_IDENTITY
+    ErrorScenario('T06', 2, (('MISSING_IDENTITY', 'FATAL'),), [
+        _mk(BASE_SNAPSHOT, session_id='', message='msg'),
+    ]),
+    # T07: Fatal — TIMESTAMP_INVERSION
+    ErrorScenario('T07', 2, (('TIMESTAMP_INVERSION', 'FATAL'),), [
+        _mk(BASE_SNAPSHOT, ts='2025-01-01 09:30', message='msg1'),
+        _mk(BASE_SNAPSHOT, bar='101', message='msg2'),
+    ]),
+    # T08: Fatal — ZONE_TYPE_INCONSISTENCY
+    ErrorScenario('T08', 2, (('ZONE_TYPE_INCONSISTENCY', 'FATAL'),), [
+        BASE_ENGAGEMENT,
+        _mk(BASE_ENGAGEMENT, ts='2025-01-01 09:05', bar='105', zone_type='PRIOR_POC'),
+    ]),
+    # T09: Fatal — UNSORTED_INPUT
+    ErrorScenario('T09', 3, (('UNSORTED_INPUT', 'FATAL'),), [
+        _mk(BASE_SNAPSHOT, ts='2025-01-01 09:05', bar='105', message='msg2'),
+        _mk(BASE_SNAPSHOT, message='msg1'),
+    ]),
+    # T10: Recoverable — INVALID_ENGAGEMENT_PRICE
+    ErrorScenario('T10', 1, (('INVALID_ENGAGEMENT_PRICE', 'RECOVERABLE'),), [
+        _mk(BASE_ENGAGEMENT, entry_price='0'),
+    ], expected_engagements=0, engagement_note='quarantined'),
+    # T11: Recoverable — INVALID_OUTCOME
+    ErrorScenario('T11', 1, (('INVALID_OUTCOME', 'RECOVERABLE'),), [
+        _mk(BASE_ENGAGEMENT, outcome='INVALID_VALUE'),
+    ], expected_engagements=0, engagement_note='quarantined'),
+    # T12: Recoverable — DUPLICATE_ENGAGEMENT
+    ErrorScenario('T12', 1, (('DUPLICATE_ENGAGEMENT', 'RECOVERABLE'),), [
+        BASE_ENGAGEMENT,
+        _mk(BASE_ENGAGEMENT, exit_price='6002', bars='6', outcome='ACCEPT', escape_vel='0.6',
+            vol_ratio='0.9'),
+    ], expected_engagements=1, engagement_note='first wins', first_outcome='TEST'),
+    # T13: Recoverable — DUPLICATE_ROW (Exact Match): three identical rows
+    ErrorScenario('T13', 1, (('DUPLICATE_ROW', 'RECOVERABLE'),), [
+        BASE_ENGAGEMENT,
+    ] * 3, expected_engagements=1, engagement_note='deduped'),
+]
 
 
-def test_t13_recoverable_duplicate_row(tmp_dir: Path) -> TestResult:
-    """T13: Recoverable — DUPLICATE_ROW (Exact Match)"""
-    result = TestResult("T13")
+def check_error_scenario(scenario: ErrorScenario, tmp_dir: Path) -> TestResult:
+    """T03-T13: Fatal / Recoverable — exit code, engagement count, error rows."""
+    result = TestResult(scenario.test_id)
 
-    # Three identical rows
-    row = {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-           'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-           'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-           'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-           'market_state': '', 'phase': '', 'message': ''}
+    run = run_scenario(tmp_dir, scenario.input_rows)
 
-    input_rows = [row.copy(), row.copy(), row.copy()]
+    if run.exit_code != scenario.expected_exit:
+        result.fail(f"Expected exit code {scenario.expected_exit}, got {run.exit_code}")
 
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
+    expected = scenario.expected_engagements
+    if expected is not None:
+        if len(run.engagements) != expected:
+            noun = 'engagement' if expected == 1 else 'engagements'
+            result.fail(f"Expected {expected} {noun} ({scenario.engagement_note}), "
+                        f"got {len(run.engagements)}")
+        if scenario.first_outcome is not None:
+            outcome = run.engagements[0]['outcome']
+            if outcome != scenario.first_outcome:
+                result.fail(f"Expected first row (outcome={scenario.first_outcome}), got {outcome}")
 
-    exit_code = run_pipeline(input_path, output_dir)
+    for error_type, severity in scenario.expected_errors:
+        if (error_type, severity) not in run.error_keys:
+            result.fail(f"Expected {error_type} {severity} error")
 
-    if exit_code != 1:
-        result.fail(f"Expected exit code 1, got {exit_code}")
-
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 1:
-        result.fail(f"Expected 1 engagement (deduped), got {len(engagements)}")
-
-    errors = read_csv(output_dir / 'error.csv')
-    dup_found = any(e['error_type'] == 'DUPLICATE_ROW' and e['severity'] == 'RECOVERABLE' for e in errors)
-    if not dup_found:
-        result.fail("Expected DUPLICATE_ROW RECOVERABLE error")
-
-    if not result.errors:
-        result.passed = True
     return result
 
 
@@ -597,35 +462,24 @@ def test_t14_orphan_engagement(tmp_dir: Path) -> TestResult:
     result = TestResult("T14")
 
     input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
+        BASE_ENGAGEMENT,
     ]
 
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
-
-    exit_code = run_pipeline(input_path, output_dir)
+    run = run_scenario(tmp_dir, input_rows)
 
     # Orphan is a flag, not an error - exit code should be 0
-    if exit_code != 0:
-        result.fail(f"Expected exit code 0, got {exit_code}")
-
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 1:
-        result.fail(f"Expected 1 engagement, got {len(engagements)}")
-    else:
-        eng = engagements[0]
-        if eng['orphan'] != 'TRUE':
-            result.fail(f"Expected orphan=TRUE, got {eng['orphan']}")
-        if 'ORPHAN' not in eng['_flags']:
-            result.fail(f"Expected ORPHAN in _flags, got {eng['_flags']}")
-
-    if not result.errors:
-        result.passed = True
+    if run.exit_code != 0:
+        result.fail(f"Expected exit code 0, got {run.exit_code}")
+
+    if len(run.engagements) != 1:
+        result.fail(f"Expected 1 engagement, got {len(run.engagements)}")
+
+    eng = run.engagements[0]
+    if eng['orphan'] != TRUE:
+        result.fail(f"Expected orphan=TRUE, got {eng['orphan']}")
+    if FLAG_ORPHAN not in _flags(eng):
+        result.fail(f"Expected ORPHAN in _flags, got {eng['_flags']}")
+
     return result
 
 
@@ -634,44 +488,24 @@ def test_t15_stale_context(tmp_dir: Path) -> TestResult:
     result = TestResult("T15")
 
     input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': 'ROTATION', 'message': 'msg'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'MODE_LOCK', 'zone_id': '0', 'zone_type': '',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': 'RESPONSIVE', 'facilitation': 'EFFICIENT',
-         'market_state': 'BALANCE', 'phase': 'ROTATION', 'message': 'raw:X'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 10:00', 'bar': '151',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
+        *CONTEXT_PREFIX,
+        _mk(BASE_ENGAGEMENT, ts='2025-01-01 10:00', bar='151'),
     ]
 
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
+    run = run_scenario(tmp_dir, input_rows)
 
-    exit_code = run_pipeline(input_path, output_dir)
+    if run.exit_code != 0:
+        result.fail(f"Expected exit code 0, got {run.exit_code}")
+
+    if len(run.engagements) != 1:
+        result.fail(f"Expected 1 engagement, got {len(run.engagements)}")
+
+    eng = run.engagements[0]
+    if eng['context_stale'] != TRUE:
+        result.fail(f"Expected context_stale=TRUE, got {eng['context_stale']}")
+    if FLAG_STALE not in _flags(eng):
+        result.fail(f"Expected STALE_CONTEXT in _flags, got {eng['_flags']}")
 
-    if exit_code != 0:
-        result.fail(f"Expected exit code 0, got {exit_code}")
-
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 1:
-        result.fail(f"Expected 1 engagement, got {len(engagements)}")
-    else:
-        eng = engagements[0]
-        if eng['context_stale'] != 'TRUE':
-            result.fail(f"Expected context_stale=TRUE, got {eng['context_stale']}")
-        if 'STALE_CONTEXT' not in eng['_flags']:
-            result.fail(f"Expected STALE_CONTEXT in _flags, got {eng['_flags']}")
-
-    if not result.errors:
-        result.passed = True
     return result
 
 
@@ -680,49 +514,33 @@ def test_t16_partial_context(tmp_dir: Path) -> TestResult:
     result = TestResult("T16")
 
     input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': 'AT_BOUNDARY', 'message': 'msg'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:05', 'bar': '105',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
+        _mk(BASE_SNAPSHOT, phase='AT_BOUNDARY', message='msg'),
+        _mk(BASE_ENGAGEMENT, ts='2025-01-01 09:05', bar='105'),
     ]
 
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
+    run = run_scenario(tmp_dir, input_rows)
 
-    exit_code = run_pipeline(input_path, output_dir)
+    if run.exit_code != 0:
+        result.fail(f"Expected exit code 0, got {run.exit_code}")
+
+    if len(run.contexts) != 1:
+        result.fail(f"Expected 1 context, got {len(run.contexts)}")
+
+    ctx = run.contexts[0]
+    if ctx['context_complete'] != FALSE:
+        result.fail(f"Expected context_complete=FALSE, got {ctx['context_complete']}")
+
+    if len(run.engagements) != 1:
+        result.fail(f"Expected 1 engagement, got {len(run.engagements)}")
+
+    eng = run.engagements[0]
+    if eng['ctx_phase'] != 'AT_BOUNDARY':
+        result.fail(f"Expected ctx_phase=AT_BOUNDARY, got {eng['ctx_phase']}")
+    if eng['ctx_aggression'] != '':
+        result.fail(f"Expected ctx_aggression=NULL/'', got {eng['ctx_aggression']}")
+    if FLAG_PARTIAL not in _flags(eng):
+        result.fail(f"Expected PARTIAL_CONTEXT in _flags, got {eng['_flags']}")
 
-    if exit_code != 0:
-        result.fail(f"Expected exit code 0, got {exit_code}")
-
-    contexts = read_csv(output_dir / 'context.csv')
-    if len(contexts) != 1:
-        result.fail(f"Expected 1 context, got {len(contexts)}")
-    else:
-        ctx = contexts[0]
-        if ctx['context_complete'] != 'FALSE':
-            result.fail(f"Expected context_complete=FALSE, got {ctx['context_complete']}")
-
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 1:
-        result.fail(f"Expected 1 engagement, got {len(engagements)}")
-    else:
-        eng = engagements[0]
-        if eng['ctx_phase'] != 'AT_BOUNDARY':
-            result.fail(f"Expected ctx_phase=AT_BOUNDARY, got {eng['ctx_phase']}")
-        if eng['ctx_aggression'] != '':
-            result.fail(f"Expected ctx_aggression=NULL/'', got {eng['ctx_aggression']}")
-        if 'PARTIAL_CONTEXT' not in eng['_flags']:
-            result.fail(f"Expected PARTIAL_CONTEXT in _flags, got {eng['_flags']}")
-
-    if not result.errors:
-        result.passed = True
     return result
 
 
@@ -731,45 +549,25 @@ def test_t17_staleness_at_threshold(tmp_dir: Path) -> TestResult:
     result = TestResult("T17")
 
     input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': 'ROTATION', 'message': 'msg'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'MODE_LOCK', 'zone_id': '0', 'zone_type': '',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': 'RESPONSIVE', 'facilitation': 'EFFICIENT',
-         'market_state': 'BALANCE', 'phase': 'ROTATION', 'message': 'raw:X'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:50', 'bar': '150',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
+        *CONTEXT_PREFIX,
+        _mk(BASE_ENGAGEMENT, ts='2025-01-01 09:50', bar='150'),
     ]
 
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
+    run = run_scenario(tmp_dir, input_rows)
 
-    exit_code = run_pipeline(input_path, output_dir)
+    if run.exit_code != 0:
+        result.fail(f"Expected exit code 0, got {run.exit_code}")
+
+    if len(run.engagements) != 1:
+        result.fail(f"Expected 1 engagement, got {len(run.engagements)}")
+
+    eng = run.engagements[0]
+    # Delta = 150 - 100 = 50, NOT > 50, so NOT stale
+    if eng['context_stale'] != FALSE:
+        result.fail(f"Expected context_stale=FALSE (delta=50, not >50), got {eng['context_stale']}")
+    if eng['_flags'] != '':
+        result.fail(f"Expected no flags, got {eng['_flags']}")
 
-    if exit_code != 0:
-        result.fail(f"Expected exit code 0, got {exit_code}")
-
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 1:
-        result.fail(f"Expected 1 engagement, got {len(engagements)}")
-    else:
-        eng = engagements[0]
-        # Delta = 150 - 100 = 50, NOT > 50, so NOT stale
-        if eng['context_stale'] != 'FALSE':
-            result.fail(f"Expected context_stale=FALSE (delta=50, not >50), got {eng['context_stale']}")
-        if eng['_flags'] != '':
-            result.fail(f"Expected no flags, got {eng['_flags']}")
-
-    if not result.errors:
-        result.passed = True
     return result
 
 
@@ -778,45 +576,25 @@ def test_t18_staleness_past_threshold(tmp_dir: Path) -> TestResult:
     result = TestResult("T18")
 
     input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': 'ROTATION', 'message': 'msg'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'MODE_LOCK', 'zone_id': '0', 'zone_type': '',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': 'RESPONSIVE', 'facilitation': 'EFFICIENT',
-         'market_state': 'BALANCE', 'phase': 'ROTATION', 'message': 'raw:X'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:51', 'bar': '151',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
+        *CONTEXT_PREFIX,
+        _mk(BASE_ENGAGEMENT, ts='2025-01-01 09:51', bar='151'),
     ]
 
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
+    run = run_scenario(tmp_dir, input_rows)
 
-    exit_code = run_pipeline(input_path, output_dir)
+    if run.exit_code != 0:
+        result.fail(f"Expected exit code 0, got {run.exit_code}")
+
+    if len(run.engagements) != 1:
+        result.fail(f"Expected 1 engagement, got {len(run.engagements)}")
+
+    eng = run.engagements[0]
+    # Delta = 151 - 100 = 51, > 50, so IS stale
+    if eng['context_stale'] != TRUE:
+        result.fail(f"Expected context_stale=TRUE (delta=51, >50), got {eng['context_stale']}")
+    if FLAG_STALE not in _flags(eng):
+        result.fail(f"Expected STALE_CONTEXT in _flags, got {eng['_flags']}")
 
-    if exit_code != 0:
-        result.fail(f"Expected exit code 0, got {exit_code}")
-
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 1:
-        result.fail(f"Expected 1 engagement, got {len(engagements)}")
-    else:
-        eng = engagements[0]
-        # Delta = 151 - 100 = 51, > 50, so IS stale
-        if eng['context_stale'] != 'TRUE':
-            result.fail(f"Expected context_stale=TRUE (delta=51, >50), got {eng['context_stale']}")
-        if 'STALE_CONTEXT' not in eng['_flags']:
-            result.fail(f"Expected STALE_CONTEXT in _flags, got {eng['_flags']}")
-
-    if not result.errors:
-        result.passed = True
     return result
 
 
@@ -825,50 +603,29 @@ def test_t19_same_bar_context_engagement(tmp_dir: Path) -> TestResult:
     result = TestResult("T19")
 
     input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': 'ROTATION', 'message': 'msg'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'MODE_LOCK', 'zone_id': '0', 'zone_type': '',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': 'RESPONSIVE', 'facilitation': 'EFFICIENT',
-         'market_state': 'BALANCE', 'phase': 'ROTATION', 'message': 'raw:X'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
+        *CONTEXT_PREFIX,
+        BASE_ENGAGEMENT,
     ]
 
-    input_path = tmp_dir / 'input.csv'
-    output_dir = tmp_dir / 'output'
-    write_csv(input_path, FULL_HEADERS, input_rows)
+    run = run_scenario(tmp_dir, input_rows)
 
-    exit_code = run_pipeline(input_path, output_dir)
+    if run.exit_code != 0:
+        result.fail(f"Expected exit code 0, got {run.exit_code}")
+
+    if len(run.contexts) != 1:
+        result.fail(f"Expected 1 context, got {len(run.contexts)}")
+
+    if len(run.engagements) != 1:
+        result.fail(f"Expected 1 engagement, got {len(run.engagements)}")
+
+    eng = run.engagements[0]
+    if eng['context_bar'] != '100':
+        result.fail(f"Expected context_bar=100, got {eng['context_bar']}")
+    if eng['orphan'] != FALSE:
+        result.fail(f"Expected orphan=FALSE, got {eng['orphan']}")
+    if eng['context_stale'] != FALSE:
+        result.fail(f"Expected context_stale=FALSE, got {eng['context_stale']}")
 
-    if exit_code != 0:
-        result.fail(f"Expected exit code 0, got {exit_code}")
-
-    contexts = read_csv(output_dir / 'context.csv')
-    if len(contexts) != 1:
-        result.fail(f"Expected 1 context, got {len(contexts)}")
-
-    engagements = read_csv(output_dir / 'engagement.csv')
-    if len(engagements) != 1:
-        result.fail(f"Expected 1 engagement, got {len(engagements)}")
-    else:
-        eng = engagements[0]
-        if eng['context_bar'] != '100':
-            result.fail(f"Expected context_bar=100, got {eng['context_bar']}")
-        if eng['orphan'] != 'FALSE':
-            result.fail(f"Expected orphan=FALSE, got {eng['orphan']}")
-        if eng['context_stale'] != 'FALSE':
-            result.fail(f"Expected context_stale=FALSE, got {eng['context_stale']}")
-
-    if not result.errors:
-        result.passed = True
     return result
 
 
@@ -876,62 +633,35 @@ def test_t20_determinism_duplicate_order(tmp_dir: Path) -> TestResult:
     """T20: Determinism — Duplicate Resolution Order (first wins)"""
     result = TestResult("T20")
 
+    accept_row = _mk(BASE_ENGAGEMENT, exit_price='6002', bars='6', outcome='ACCEPT',
+                     escape_vel='0.6', vol_ratio='0.9')
+
     # Run A: TEST first
-    input_rows_a = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6002', 'bars': '6', 'outcome': 'ACCEPT',
-         'escape_vel': '0.6', 'vol_ratio': '0.9', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
-    ]
+    input_rows_a = [BASE_ENGAGEMENT, accept_row]
 
-    input_path_a = tmp_dir / 'input_a.csv'
-    output_dir_a = tmp_dir / 'output_a'
-    write_csv(input_path_a, FULL_HEADERS, input_rows_a)
-    exit_code_a = run_pipeline(input_path_a, output_dir_a)
+    run_a = run_scenario(tmp_dir, input_rows_a, '_a')
 
     # Run B: ACCEPT first (reversed)
-    input_rows_b = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6002', 'bars': '6', 'outcome': 'ACCEPT',
-         'escape_vel': '0.6', 'vol_ratio': '0.9', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
-    ]
+    input_rows_b = input_rows_a[::-1]
 
-    input_path_b = tmp_dir / 'input_b.csv'
-    output_dir_b = tmp_dir / 'output_b'
-    write_csv(input_path_b, FULL_HEADERS, input_rows_b)
-    exit_code_b = run_pipeline(input_path_b, output_dir_b)
+    run_b = run_scenario(tmp_dir, input_rows_b, '_b')
 
-    if exit_code_a != 1 or exit_code_b != 1:
-        result.fail(f"Expected exit codes 1, got A={exit_code_a}, B={exit_code_b}")
+    if run_a.exit_code != 1 or run_b.exit_code != 1:
+        result.fail(f"Expected exit codes 1, got A={run_a.exit_code}, B={run_b.exit_code}")
 
-    eng_a = read_csv(output_dir_a / 'engagement.csv')
-    eng_b = read_csv(output_dir_b / 'engagement.csv')
+    eng_a = run_a.engagements
+    eng_b = run_b.engagements
 
     if len(eng_a) != 1 or len(eng_b) != 1:
         result.fail(f"Expected 1 engagement each, got A={len(eng_a)}, B={len(eng_b)}")
-    else:
-        # A should have TEST (first in A's input)
-        if eng_a[0]['outcome'] != 'TEST':
-            result.fail(f"Run A: Expected outcome=TEST (first), got {eng_a[0]['outcome']}")
-        # B should have ACCEPT (first in B's input)
-        if eng_b[0]['outcome'] != 'ACCEPT':
-            result.fail(f"Run B: Expected outcome=ACCEPT (first), got {eng_b[0]['outcome']}")
-
-    if not result.errors:
-        result.passed = True
+
+    # A should have TEST (first in A's input)
+    if eng_a[0]['outcome'] != 'TEST':
+        result.fail(f"Run A: Expected outcome=TEST (first), got {eng_a[0]['outcome']}")
+    # B should have ACCEPT (first in B's input)
+    if eng_b[0]['outcome'] != 'ACCEPT':
+        result.fail(f"Run B: Expected outcome=ACCEPT (first), got {eng_b[0]['outcome']}")
+
     return result
 
 
@@ -940,50 +670,30 @@ def test_t21_idempotency(tmp_dir: Path) -> TestResult:
     result = TestResult("T21")
 
     input_rows = [
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'PHASE_SNAPSHOT', 'zone_id': '-1', 'zone_type': 'NONE',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': 'ROTATION', 'message': 'msg'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:00', 'bar': '100',
-         'event_type': 'MODE_LOCK', 'zone_id': '0', 'zone_type': '',
-         'entry_price': '0', 'exit_price': '0', 'bars': '0', 'outcome': '',
-         'escape_vel': '0', 'vol_ratio': '0', 'aggression': 'RESPONSIVE', 'facilitation': 'EFFICIENT',
-         'market_state': 'BALANCE', 'phase': 'ROTATION', 'message': 'raw:X'},
-        {'session_id': '1', 'session_type': 'GLOBEX', 'ts': '2025-01-01 09:05', 'bar': '105',
-         'event_type': 'ENGAGEMENT_FINAL', 'zone_id': '3', 'zone_type': 'VPB_VAL',
-         'entry_price': '6000', 'exit_price': '6001', 'bars': '5', 'outcome': 'TEST',
-         'escape_vel': '0.5', 'vol_ratio': '0.8', 'aggression': '', 'facilitation': '',
-         'market_state': '', 'phase': '', 'message': ''},
+        *CONTEXT_PREFIX,
+        _mk(BASE_ENGAGEMENT, ts='2025-01-01 09:05', bar='105'),
     ]
 
-    # Run 1
+    # Run 1 (separate processes with different hash seeds, so hash-order
+    # dependent output shows up as a difference)
     input_path = tmp_dir / 'input.csv'
     output_dir_1 = tmp_dir / 'output_1'
     write_csv(input_path, FULL_HEADERS, input_rows)
-    exit_code_1 = run_pipeline(input_path, output_dir_1)
+    exit_code_1 = run_pipeline_subprocess(input_path, output_dir_1, hash_seed=1)
 
     # Run 2 (same input)
     output_dir_2 = tmp_dir / 'output_2'
-    exit_code_2 = run_pipeline(input_path, output_dir_2)
+    exit_code_2 = run_pipeline_subprocess(input_path, output_dir_2, hash_seed=2)
 
     if exit_code_1 != exit_code_2:
         result.fail(f"Exit codes differ: run1={exit_code_1}, run2={exit_code_2}")
 
-    # Compare context.csv
-    ctx_1 = read_csv(output_dir_1 / 'context.csv')
-    ctx_2 = read_csv(output_dir_2 / 'context.csv')
-    if ctx_1 != ctx_2:
-        result.fail("context.csv differs between runs")
-
-    # Compare engagement.csv
-    eng_1 = read_csv(output_dir_1 / 'engagement.csv')
-    eng_2 = read_csv(output_dir_2 / 'engagement.csv')
-    if eng_1 != eng_2:
-        result.fail("engagement.csv differs between runs")
+    # Compare context.csv and engagement.csv byte for byte
+    # (error.csv carries a detection timestamp, so it is expected to differ)
+    for name in ('context.csv', 'engagement.csv'):
+        if _file_digest(output_dir_1 / name) != _file_digest(output_dir_2 / name):
+            result.fail(f"{name} differs between runs")
 
-    if not result.errors:
-        result.passed = True
     return result
 
 
@@ -994,17 +704,7 @@ def test_t21_idempotency(tmp_dir: Path) -> TestResult:
 ALL_TESTS = [
     test_t01_happy_path_complete,
     test_t02_multiple_sessions,
-    test_t03_fatal_duplicate_snapshot,
-    test_t04_fatal_duplicate_lock,
-    test_t05_fatal_identity_conflict,
-    test_t06_fatal_missing_identity,
-    test_t07_fatal_timestamp_inversion,
-    test_t08_fatal_zone_type_inconsistency,
-    test_t09_fatal_unsorted_input,
-    test_t10_recoverable_invalid_price,
-    test_t11_recoverable_invalid_outcome,
-    test_t12_recoverable_duplicate_engagement,
-    test_t13_recoverable_duplicate_row,
+    *(functools.partial(check_error_scenario, scenario) for scenario in ERROR_SCENARIOS),
     test_t14_orphan_engagement,
     test_t15_stale_context,
     test_t16_partial_context,
@@ -1016,7 +716,33 @@ ALL_TESTS = [
 ]
 
 
+def _tmp_base() -> Optional[str]:
+    """RAM-backed /dev/shm for test files when usable, unless TMPDIR says otherwise."""
+    if 'TMPDIR' not in os.environ and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    return None  # tempfile default
+
+
+def _run_test(job: Tuple[Callable[[Path], TestResult], Path]) -> TestResult:
+    """Run one test in its own (not yet created) tmp_dir; module-level so a pool can pickle it."""
+    test_fn, tmp_dir = job
+    tmp_dir.mkdir()
+    try:
+        return test_fn(tmp_dir)
+    except _TestAbort as abort:
+        return abort.result
+
+
 def main():
+    # --jobs N spreads the tests over N worker processes, --jobs auto over
+    # every core (default: run serially)
+    jobs = 1
+    if '--jobs' in sys.argv:
+        idx = sys.argv.index('--jobs')
+        if idx + 1 < len(sys.argv):
+            arg = sys.argv[idx + 1]
+            jobs = (os.cpu_count() or 1) if arg == 'auto' else int(arg)
+
     print("=" * 60)
     print("Merge Pipeline Test Suite — Spec v1.1")
     print("=" * 60)
@@ -1024,25 +750,31 @@ def main():
 
     passed = 0
     failed = 0
-    results = []
-
-    for test_fn in ALL_TESTS:
-        # Create temp dir for each test
-        tmp_dir = Path(tempfile.mkdtemp())
-        try:
-            result = test_fn(tmp_dir)
-            results.append(result)
+    lines = []  # report lines, printed in one go once every test has finished
+
+    # One temp root for the whole run, one subdir per test, removed once at the end
+    tmp_root = Path(tempfile.mkdtemp(prefix='merge_pipeline_tests_', dir=_tmp_base()))
+    try:
+        job_list = [(test_fn, tmp_root / f'{index:02d}')
+                    for index, test_fn in enumerate(ALL_TESTS, 1)]
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(_run_test, job_list))
+        else:
+            results = map(_run_test, job_list)
+
+        for result in results:
             if result.passed:
                 passed += 1
-                print(f"  [PASS] {result.test_id}")
+                lines.append(f"  [PASS] {result.test_id}")
             else:
                 failed += 1
-                print(f"  [FAIL] {result.test_id}")
-                for err in result.errors:
-                    print(f"         - {err}")
-        finally:
-            shutil.rmtree(tmp_dir, ignore_errors=True)
+                lines.append(f"  [FAIL] {result.test_id}")
+                lines.extend(f"         - {err}" for err in result.errors)
+    finally:
+        shutil.rmtree(tmp_root, ignore_errors=True)
 
+    print("\n".join(lines))
     print()
     print("=" * 60)
     print(f"Results: {passed} passed, {failed} failed, {len(ALL_TESTS)} total")